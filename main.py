@@ -6,36 +6,43 @@ Author: M A Mohammed Mishal
 License: MIT
 """
 
+import atexit
 import sys
 import pathlib
-import json
 import pickle
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
+from modules import json_compat
 
-from modules.ui import EchoMainWindow
-from modules.stt import VoskManager
-from modules.tts import TTS
-from modules.auth import Authenticator
-from modules.app_discovery import AppDiscovery
-from modules.parser import CommandParser
-from modules.executor import Executor
-from modules.accessibility import AccessibilityManager
-from modules.config import ConfigManager
 
-# Setup logging
+def _dump_json(path, data):
+    """Write pretty-printed JSON, using orjson when available"""
+    path.write_bytes(json_compat.dumps(data, indent=True))
+
+# Setup logging: handlers live behind a queue so log calls are
+# non-blocking enqueues and disk writes happen on a listener thread
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Leave final formatting to the listener-side handlers
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('echoos.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
 
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('echoos.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,25 +108,22 @@ def initialize_config():
                 "wake_up": ["wake up", "start listening", "resume", "hello echo"]
             }
         }
-        commands_file.write_text(json.dumps(default_commands, indent=2))
-    
+        _dump_json(commands_file, default_commands)
+        # Precompiled pickle alongside the JSON: faster to load on every
+        # subsequent launch (schema version invalidates stale copies)
+        with open(config_dir / "commands.pkl", "wb") as f:
+            pickle.dump({'_schema': 2, 'data': default_commands}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
     # Initialize apps.json
     apps_file = config_dir / "apps.json"
     if not apps_file.exists():
-        apps_file.write_text(json.dumps({"apps": []}, indent=2))
-    
-    # Initialize user database
-    users_file = config_dir / "users.pkl"
-    if not users_file.exists():
-        with open(users_file, "wb") as f:
-            pickle.dump({}, f)
-    
-    # Initialize sessions database
-    sessions_file = config_dir / "sessions.pkl"
-    if not sessions_file.exists():
-        with open(sessions_file, "wb") as f:
-            pickle.dump({}, f)
+        _dump_json(apps_file, {"apps": []})
     
+    # Users and sessions live in config/auth.db (sqlite); the schema is
+    # created by Authenticator on first construction, so no seed files
+    # are needed here. Legacy users.pkl/sessions.pkl are migrated there.
+
     logger.info("Configuration initialized successfully")
 
 
@@ -134,7 +138,17 @@ def main():
     try:
         # Initialize configuration
         initialize_config()
-        
+
+        # Import heavy modules only after config is ready so startup
+        # stays cheap until they are actually needed (lazy via modules/__init__)
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QThread, QTimer
+        from modules import (
+            EchoMainWindow, VoskManager, TTS, Authenticator,
+            AppDiscovery, CommandParser, Executor, AccessibilityManager
+        )
+        from modules.ui import DiscoveryWorker
+
         # Create Qt application
         app = QApplication(sys.argv)
         app.setApplicationName("EchoOS")
@@ -143,31 +157,30 @@ def main():
         
         # Initialize core components
         logger.info("Initializing core components...")
-        
-        # Text-to-Speech
+
+        # Text-to-Speech (needed by the other components)
         logger.info("→ Initializing TTS engine...")
         tts = TTS()
-        
-        # Authentication System
-        logger.info("→ Initializing authentication system...")
-        auth = Authenticator(tts=tts)
-        
-        # Speech-to-Text
-        logger.info("→ Initializing speech recognition...")
-        stt_manager = VoskManager(tts=tts)
-        
-        # Application Discovery
-        logger.info("→ Initializing app discovery...")
-        app_discovery = AppDiscovery()
-        
+
+        # Vosk model load, auth database and app discovery are independent
+        # and mostly I/O-bound, so run them concurrently
+        logger.info("→ Initializing auth, speech recognition and app discovery...")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            auth_future = pool.submit(Authenticator, tts=tts)
+            stt_future = pool.submit(VoskManager, tts=tts)
+            apps_future = pool.submit(AppDiscovery)
+            auth = auth_future.result()
+            stt_manager = stt_future.result()
+            app_discovery = apps_future.result()
+
         # Command Parser
         logger.info("→ Initializing command parser...")
         parser = CommandParser(tts=tts)
-        
+
         # Command Executor
         logger.info("→ Initializing command executor...")
         executor = Executor(tts=tts, auth=auth)
-        
+
         # Accessibility Manager
         logger.info("→ Initializing accessibility features...")
         accessibility = AccessibilityManager(tts=tts)
@@ -189,7 +202,20 @@ def main():
         
         # Show window
         main_window.show()
-        
+
+        # Run app discovery in the background now that the window is up;
+        # the worker updates the executor and status label when done
+        main_window.apps_status.setText("App discovery: Discovering apps…")
+        discovery_thread = QThread()
+        discovery_worker = DiscoveryWorker(app_discovery)
+        discovery_worker.moveToThread(discovery_thread)
+        discovery_thread.started.connect(discovery_worker.run)
+        discovery_worker.finished.connect(main_window._on_apps_discovered)
+        discovery_worker.finished.connect(discovery_thread.quit)
+        discovery_thread.finished.connect(discovery_worker.deleteLater)
+        discovery_thread.finished.connect(discovery_thread.deleteLater)
+        discovery_thread.start()
+
         # Setup periodic session cleanup (every 5 minutes)
         cleanup_timer = QTimer()
         cleanup_timer.timeout.connect(auth.cleanup_expired_sessions)
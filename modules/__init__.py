@@ -1,7 +1,53 @@
 """
 EchoOS Modules Package
 Contains all core functionality modules
+
+Heavy submodules (Qt, Vosk, TTS, ...) are resolved lazily via PEP 562
+module-level __getattr__ so importing the package stays cheap until a
+component is actually constructed. Set ECHOOS_EAGER_IMPORT=1 to force
+eager resolution of every export (useful in CI to catch import errors).
 """
 
+import importlib
+import os
+
 __version__ = "2.0.0"
 __author__ = "M A Mohammed Mishal"
+
+# Map of public names to the submodule that defines them
+_LAZY_IMPORTS = {
+    'EchoMainWindow': '.ui',
+    'VoskManager': '.stt',
+    'TTS': '.tts',
+    'Authenticator': '.auth',
+    'AppDiscovery': '.app_discovery',
+    'CommandParser': '.parser',
+    'Executor': '.executor',
+    'AccessibilityManager': '.accessibility',
+    'ConfigManager': '.config',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Resolve exported names lazily (PEP 562)"""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    # Cache on the package so __getattr__ only runs once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get('ECHOOS_EAGER_IMPORT') == '1':
+    for _name in __all__:
+        __getattr__(_name)
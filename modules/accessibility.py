@@ -5,58 +5,105 @@ Cross-platform support for Windows and macOS
 """
 
 import logging
+import threading
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Sentinel for "import attempted and failed" (None means "not tried yet")
+_UNAVAILABLE = False
+
+# Screenshots wider than this are downsampled before OCR
+MAX_OCR_WIDTH = 1600
+
 
 class AccessibilityManager:
     """Manages accessibility features"""
-    
+
     def __init__(self, tts=None):
         """
         Initialize accessibility manager
-        
+
         Args:
             tts: TTS instance for feedback
         """
         self.tts = tts
-        self.pyautogui_available = False
-        self.pytesseract_available = False
-        
-        # Try to import optional dependencies
-        try:
-            import pyautogui
-            self.pyautogui = pyautogui
-            self.pyautogui_available = True
-            logger.info("PyAutoGUI available")
-        except ImportError:
-            logger.warning("PyAutoGUI not available - install for full accessibility features")
-        
-        try:
-            import pytesseract
-            self.pytesseract = pytesseract
-            self.pytesseract_available = True
-            logger.info("PyTesseract available")
-        except ImportError:
-            logger.warning("PyTesseract not available - install for screen reading")
-        
+
+        # Optional dependencies are imported lazily on first use so that
+        # constructing the manager doesn't pay for pyautogui/pytesseract
+        # (and their transitive imports) when the features go unused
+        self._pyautogui = None
+        self._pytesseract = None
+
         logger.info("Accessibility manager initialized")
-    
-    def read_screen(self) -> bool:
-        """Read text from screen using OCR"""
-        if not self.pytesseract_available or not self.pyautogui_available:
+
+    def _get_pyautogui(self):
+        """Import and cache pyautogui on first use, or None if unavailable"""
+        if self._pyautogui is None:
+            try:
+                import pyautogui
+                self._pyautogui = pyautogui
+                logger.info("PyAutoGUI available")
+            except ImportError:
+                self._pyautogui = _UNAVAILABLE
+                logger.warning("PyAutoGUI not available - install for full accessibility features")
+        return self._pyautogui or None
+
+    def _get_pytesseract(self):
+        """Import and cache pytesseract on first use, or None if unavailable"""
+        if self._pytesseract is None:
+            try:
+                import pytesseract
+                self._pytesseract = pytesseract
+                logger.info("PyTesseract available")
+            except ImportError:
+                self._pytesseract = _UNAVAILABLE
+                logger.warning("PyTesseract not available - install for screen reading")
+        return self._pytesseract or None
+
+    def read_screen(self, blocking: bool = False) -> bool:
+        """
+        Read text from screen using OCR
+
+        Args:
+            blocking: If True, run OCR inline and return its result;
+                      otherwise run it in a background thread so the
+                      caller (e.g. the UI event loop) is not blocked
+        """
+        pyautogui = self._get_pyautogui()
+        pytesseract = self._get_pytesseract()
+        if not pytesseract or not pyautogui:
             if self.tts:
                 self.tts.speak("Screen reading not available. Please install pytesseract and pyautogui")
             return False
-        
+
+        if blocking:
+            return self._read_screen_impl(pyautogui, pytesseract)
+
+        thread = threading.Thread(
+            target=self._read_screen_impl, args=(pyautogui, pytesseract)
+        )
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _read_screen_impl(self, pyautogui, pytesseract) -> bool:
+        """Screenshot, downsample and OCR (runs off the UI thread)"""
         try:
             # Take screenshot
-            screenshot = self.pyautogui.screenshot()
-            
-            # Extract text using OCR
-            text = self.pytesseract.image_to_string(screenshot)
-            
+            screenshot = pyautogui.screenshot()
+
+            # Tesseract scales with pixel count; a 1600px-wide image is
+            # plenty for screen text and ~4x cheaper on 4K displays
+            width, height = screenshot.size
+            if width > MAX_OCR_WIDTH:
+                screenshot = screenshot.resize(
+                    (MAX_OCR_WIDTH, height * MAX_OCR_WIDTH // width)
+                )
+
+            # Extract text using OCR (LSTM engine, uniform-block layout)
+            text = pytesseract.image_to_string(screenshot, config='--oem 1 --psm 6')
+
             if text.strip():
                 if self.tts:
                     # Read first few lines
@@ -68,121 +115,132 @@ class AccessibilityManager:
                 if self.tts:
                     self.tts.speak("No text found on screen")
                 return False
-                
+
         except Exception as e:
             logger.error(f"Error reading screen: {e}")
             if self.tts:
                 self.tts.speak("Error reading screen")
             return False
-    
-    def click(self, x: Optional[int] = None, y: Optional[int] = None) -> bool:
+
+    def click(self, x: Optional[int] = None, y: Optional[int] = None,
+              *, quiet: bool = False) -> bool:
         """
         Click at position or current mouse position
-        
+
         Args:
             x: X coordinate (optional)
             y: Y coordinate (optional)
+            quiet: Skip spoken feedback (for scripted/tight-loop callers)
         """
-        if not self.pyautogui_available:
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             if self.tts:
                 self.tts.speak("Click not available")
             return False
-        
+
         try:
             if x is not None and y is not None:
-                self.pyautogui.click(x, y)
+                pyautogui.click(x, y)
             else:
-                self.pyautogui.click()
-            
-            if self.tts:
+                pyautogui.click()
+
+            if self.tts and not quiet:
                 self.tts.speak("Clicked")
             return True
         except Exception as e:
             logger.error(f"Error clicking: {e}")
             return False
-    
-    def scroll(self, direction: str = 'down', amount: int = 3) -> bool:
+
+    def scroll(self, direction: str = 'down', amount: int = 3,
+               *, quiet: bool = False) -> bool:
         """
         Scroll in direction
-        
+
         Args:
             direction: 'up' or 'down'
             amount: Scroll amount
+            quiet: Skip spoken feedback (for scripted/tight-loop callers)
         """
-        if not self.pyautogui_available:
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             if self.tts:
                 self.tts.speak("Scroll not available")
             return False
-        
+
         try:
             scroll_amount = amount * 100 if direction == 'up' else -amount * 100
-            self.pyautogui.scroll(scroll_amount)
-            
-            if self.tts:
+            pyautogui.scroll(scroll_amount)
+
+            if self.tts and not quiet:
                 self.tts.speak(f"Scrolled {direction}")
             return True
         except Exception as e:
             logger.error(f"Error scrolling: {e}")
             return False
-    
+
     def move_mouse(self, x: int, y: int) -> bool:
         """Move mouse to position"""
-        if not self.pyautogui_available:
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             return False
-        
+
         try:
-            self.pyautogui.moveTo(x, y)
+            pyautogui.moveTo(x, y)
             return True
         except Exception as e:
             logger.error(f"Error moving mouse: {e}")
             return False
-    
-    def press_key(self, key: str) -> bool:
-        """Press keyboard key"""
-        if not self.pyautogui_available:
+
+    def press_key(self, key: str, *, quiet: bool = False) -> bool:
+        """Press keyboard key (quiet=True skips spoken feedback)"""
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             return False
-        
+
         try:
-            self.pyautogui.press(key)
-            if self.tts:
+            pyautogui.press(key)
+            if self.tts and not quiet:
                 self.tts.speak(f"Pressed {key}")
             return True
         except Exception as e:
             logger.error(f"Error pressing key: {e}")
             return False
-    
-    def type_text(self, text: str) -> bool:
-        """Type text"""
-        if not self.pyautogui_available:
+
+    def type_text(self, text: str, *, quiet: bool = False) -> bool:
+        """Type text (quiet=True skips spoken feedback)"""
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             return False
-        
+
         try:
-            self.pyautogui.write(text)
-            if self.tts:
+            pyautogui.write(text)
+            if self.tts and not quiet:
                 self.tts.speak("Text typed")
             return True
         except Exception as e:
             logger.error(f"Error typing text: {e}")
             return False
-    
+
     def get_screen_size(self) -> tuple:
         """Get screen dimensions"""
-        if not self.pyautogui_available:
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             return (0, 0)
-        
+
         try:
-            return self.pyautogui.size()
+            return pyautogui.size()
         except Exception as e:
             logger.error(f"Error getting screen size: {e}")
             return (0, 0)
-    
+
     def get_mouse_position(self) -> tuple:
         """Get current mouse position"""
-        if not self.pyautogui_available:
+        pyautogui = self._get_pyautogui()
+        if not pyautogui:
             return (0, 0)
-        
+
         try:
-            return self.pyautogui.position()
+            return pyautogui.position()
         except Exception as e:
             logger.error(f"Error getting mouse position: {e}")
             return (0, 0)
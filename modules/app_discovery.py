@@ -4,180 +4,332 @@ Discovers installed applications on Windows and macOS
 Builds searchable database of applications
 """
 
+import hashlib
 import os
-import json
 import logging
+import pickle
 import platform
+from concurrent.futures import ThreadPoolExecutor
+from configparser import RawConfigParser
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+from modules import json_compat
+
+# platform.system() can shell out on some OSes; resolve it once at import
+_PLATFORM = platform.system()
+
+# Bump to invalidate cached discovery results after code changes
+CACHE_VERSION = 2
+
+# Executable name prefixes that are never user-facing applications
+SKIP_EXE_PREFIXES = frozenset([
+    'unins', 'setup', 'installer', 'update', 'vcredist', 'crashpad'
+])
+
+# How deep to walk below each search root (Program Files nests installers
+# and helpers far deeper, but real app entry points live near the top)
+MAX_SCAN_DEPTH = 3
+
+# Built-in applications always added to discovery results
+_WINDOWS_COMMON_APPS = (
+    {'name': 'Notepad', 'path': 'notepad.exe', 'aliases': ['notepad']},
+    {'name': 'Calculator', 'path': 'calc.exe', 'aliases': ['calculator', 'calc']},
+    {'name': 'Paint', 'path': 'mspaint.exe', 'aliases': ['paint']},
+    {'name': 'Command Prompt', 'path': 'cmd.exe', 'aliases': ['cmd', 'command prompt', 'terminal']},
+    {'name': 'PowerShell', 'path': 'powershell.exe', 'aliases': ['powershell']},
+    {'name': 'Task Manager', 'path': 'taskmgr.exe', 'aliases': ['task manager', 'taskmgr']},
+    {'name': 'File Explorer', 'path': 'explorer.exe', 'aliases': ['explorer', 'file explorer']},
+)
+
+_MACOS_COMMON_APPS = (
+    {'name': 'Safari', 'path': '/Applications/Safari.app', 'aliases': ['safari']},
+    {'name': 'Finder', 'path': '/System/Library/CoreServices/Finder.app', 'aliases': ['finder']},
+    {'name': 'Terminal', 'path': '/System/Applications/Utilities/Terminal.app', 'aliases': ['terminal']},
+    {'name': 'TextEdit', 'path': '/System/Applications/TextEdit.app', 'aliases': ['textedit', 'text edit']},
+    {'name': 'Calculator', 'path': '/System/Applications/Calculator.app', 'aliases': ['calculator', 'calc']},
+    {'name': 'Calendar', 'path': '/System/Applications/Calendar.app', 'aliases': ['calendar']},
+    {'name': 'Mail', 'path': '/System/Applications/Mail.app', 'aliases': ['mail', 'email']},
+)
+
+
+def _walk_exe_files(root: str, depth: int = MAX_SCAN_DEPTH):
+    """Yield .exe paths under root up to a bounded depth via os.scandir"""
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth > 0:
+                            yield from _walk_exe_files(entry.path, depth - 1)
+                    elif entry.name.lower().endswith('.exe'):
+                        yield entry.path
+                except OSError as e:
+                    logger.debug(f"Error scanning {entry.path}: {e}")
+    except OSError as e:
+        logger.debug(f"Error scanning {root}: {e}")
+
 
 class AppDiscovery:
     """Discovers installed applications"""
-    
-    def __init__(self):
-        self.platform = platform.system()
+
+    def __init__(self, cache_file: str = "config/apps.cache.pkl"):
+        self.platform = _PLATFORM
         self.apps = []
+        self.cache_file = Path(cache_file)
+        self._trigrams = None  # trigram -> set of app indices, built after discovery
         logger.info(f"App discovery initialized for {self.platform}")
-    
+
+    def _search_paths(self) -> List[Path]:
+        """Get the application search roots for the current platform"""
+        if self.platform == 'Windows':
+            return [
+                Path(os.environ.get('PROGRAMFILES', 'C:\\Program Files')),
+                Path(os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')),
+                Path(os.environ.get('LOCALAPPDATA', '')) / 'Programs',
+                Path(os.environ.get('APPDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs'
+            ]
+        elif self.platform == 'Darwin':
+            return [
+                Path('/Applications'),
+                Path.home() / 'Applications',
+                Path('/System/Applications')
+            ]
+        else:
+            return [
+                Path('/usr/share/applications'),
+                Path.home() / '.local' / 'share' / 'applications'
+            ]
+
+    def _cache_key(self, search_paths: List[Path]) -> str:
+        """Compute cache key from platform and search-root mtimes"""
+        stamps = [
+            (str(p), p.stat().st_mtime_ns if p.exists() else 0)
+            for p in search_paths
+        ]
+        payload = repr((CACHE_VERSION, self.platform, sorted(stamps)))
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _load_cache(self, key: str) -> Optional[List[Dict]]:
+        """Load cached apps if the key still matches, else None"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('key') == key:
+                    return cached.get('apps')
+        except Exception as e:
+            logger.debug(f"Error reading app cache: {e}")
+        return None
+
+    def _save_cache(self, key: str, apps: List[Dict]):
+        """Persist discovery results keyed by search-root mtimes"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump({'key': key, 'apps': apps}, f)
+        except Exception as e:
+            logger.debug(f"Error writing app cache: {e}")
+
     def discover_apps(self) -> List[Dict]:
         """
         Discover installed applications
-        
+
+        Results are cached on disk keyed by the search-root mtimes, so
+        repeated launches skip the filesystem walk when nothing changed.
+
         Returns:
             List of discovered applications
         """
         logger.info("Starting application discovery...")
-        
+
+        cache_key = self._cache_key(self._search_paths())
+        cached = self._load_cache(cache_key)
+        if cached is not None:
+            self.apps = cached
+            self._build_search_index()
+            logger.info(f"Loaded {len(self.apps)} applications from cache")
+            return self.apps
+
         if self.platform == 'Windows':
             self.apps = self._discover_windows_apps()
         elif self.platform == 'Darwin':
             self.apps = self._discover_macos_apps()
         else:
             self.apps = self._discover_linux_apps()
-        
+
+        self._save_cache(cache_key, self.apps)
+        self._build_search_index()
         logger.info(f"Discovered {len(self.apps)} applications")
         return self.apps
-    
+
+    def _build_search_index(self):
+        """Build a trigram inverted index over app names and aliases"""
+        trigrams = {}
+        for index, app in enumerate(self.apps):
+            terms = [app['name'].lower()] + app.get('aliases', [])
+            for term in terms:
+                for pos in range(len(term) - 2):
+                    trigrams.setdefault(term[pos:pos + 3], set()).add(index)
+        self._trigrams = trigrams
+
+    @staticmethod
+    def _dedup_apps(apps: List[Dict]) -> List[Dict]:
+        """Drop duplicate (name, path) entries, keeping first occurrence"""
+        seen = set()
+        unique = []
+        for app in apps:
+            key = (app['name'].lower(), app['path'].lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(app)
+        return unique
+
+    def _scan_roots(self, scan_func, search_paths: List[Path]) -> List[Dict]:
+        """
+        Scan search roots concurrently with a thread pool
+
+        Each root is an independent disk-bound workload, so overlapping
+        them hides I/O latency. Results keep the order of search_paths.
+        """
+        roots = [p for p in search_paths if p.exists()]
+        if not roots:
+            return []
+
+        apps = []
+        workers = min(len(roots), os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(scan_func, roots):
+                apps.extend(result)
+        return apps
+
+    def _scan_windows_root(self, search_path: Path) -> List[Dict]:
+        """Scan one Windows search root for .exe applications"""
+        apps = []
+        try:
+            # Search for .exe files (bounded depth, scandir-based)
+            for exe_file in _walk_exe_files(str(search_path)):
+                try:
+                    app_name = Path(exe_file).stem
+                    # Skip uninstallers, setup helpers and the like
+                    name_lower = app_name.lower()
+                    if any(name_lower.startswith(prefix) for prefix in SKIP_EXE_PREFIXES):
+                        continue
+
+                    apps.append({
+                        'name': app_name,
+                        'path': exe_file,
+                        'aliases': [name_lower, app_name.replace(' ', '').lower()]
+                    })
+                except Exception as e:
+                    logger.debug(f"Error processing {exe_file}: {e}")
+        except Exception as e:
+            logger.error(f"Error searching {search_path}: {e}")
+        return apps
+
     def _discover_windows_apps(self) -> List[Dict]:
         """Discover Windows applications"""
+        apps = self._scan_roots(self._scan_windows_root, self._search_paths())
+
+        # Add common Windows apps
+        apps.extend(_WINDOWS_COMMON_APPS)
+        return self._dedup_apps(apps)
+    
+    def _scan_macos_root(self, search_path: Path) -> List[Dict]:
+        """Scan one macOS search root for .app bundles"""
         apps = []
-        
-        # Common Windows application directories
-        search_paths = [
-            Path(os.environ.get('PROGRAMFILES', 'C:\\Program Files')),
-            Path(os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')),
-            Path(os.environ.get('LOCALAPPDATA', '')) / 'Programs',
-            Path(os.environ.get('APPDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs'
-        ]
-        
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-            
-            try:
-                # Search for .exe files
-                for exe_file in search_path.rglob('*.exe'):
+        try:
+            # Search for .app bundles (plain suffix check, no fnmatch)
+            with os.scandir(search_path) as it:
+                for entry in it:
+                    if not entry.name.endswith('.app'):
+                        continue
                     try:
-                        app_name = exe_file.stem
-                        # Skip common system files
-                        if app_name.lower() in ['uninstall', 'setup', 'installer', 'update']:
-                            continue
-                        
+                        app_name = entry.name[:-4]
                         apps.append({
                             'name': app_name,
-                            'path': str(exe_file),
+                            'path': entry.path,
                             'aliases': [app_name.lower(), app_name.replace(' ', '').lower()]
                         })
                     except Exception as e:
-                        logger.debug(f"Error processing {exe_file}: {e}")
-            except Exception as e:
-                logger.error(f"Error searching {search_path}: {e}")
-        
-        # Add common Windows apps
-        common_apps = [
-            {'name': 'Notepad', 'path': 'notepad.exe', 'aliases': ['notepad']},
-            {'name': 'Calculator', 'path': 'calc.exe', 'aliases': ['calculator', 'calc']},
-            {'name': 'Paint', 'path': 'mspaint.exe', 'aliases': ['paint']},
-            {'name': 'Command Prompt', 'path': 'cmd.exe', 'aliases': ['cmd', 'command prompt', 'terminal']},
-            {'name': 'PowerShell', 'path': 'powershell.exe', 'aliases': ['powershell']},
-            {'name': 'Task Manager', 'path': 'taskmgr.exe', 'aliases': ['task manager', 'taskmgr']},
-            {'name': 'File Explorer', 'path': 'explorer.exe', 'aliases': ['explorer', 'file explorer']},
-        ]
-        
-        apps.extend(common_apps)
+                        logger.debug(f"Error processing {entry.path}: {e}")
+        except Exception as e:
+            logger.error(f"Error searching {search_path}: {e}")
         return apps
-    
+
     def _discover_macos_apps(self) -> List[Dict]:
         """Discover macOS applications"""
+        apps = self._scan_roots(self._scan_macos_root, self._search_paths())
+
+        # Add common macOS apps
+        apps.extend(_MACOS_COMMON_APPS)
+        return self._dedup_apps(apps)
+    
+    def _scan_linux_root(self, search_path: Path) -> List[Dict]:
+        """Scan one Linux search root for .desktop entries"""
         apps = []
-        
-        # Common macOS application directories
-        search_paths = [
-            Path('/Applications'),
-            Path.home() / 'Applications',
-            Path('/System/Applications')
-        ]
-        
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-            
-            try:
-                # Search for .app bundles
-                for app_bundle in search_path.glob('*.app'):
-                    try:
-                        app_name = app_bundle.stem
+        dir_fd = None
+        try:
+            # Anchor per-file opens on one directory handle: openat()
+            # resolves a single name instead of the full path for every
+            # .desktop file in the root
+            if os.open in os.supports_dir_fd:
+                try:
+                    dir_fd = os.open(search_path, os.O_RDONLY | os.O_DIRECTORY)
+                except OSError:
+                    dir_fd = None
+
+            # Search for .desktop files (plain suffix check, no fnmatch)
+            with os.scandir(search_path) as it:
+                entries = [(e.name, e.path) for e in it
+                           if e.name.endswith('.desktop')]
+            for entry_name, desktop_file in entries:
+                try:
+                    # Parse .desktop file as INI (C-level parse, no manual
+                    # per-line scanning)
+                    cp = RawConfigParser(strict=False, interpolation=None)
+                    if dir_fd is not None:
+                        with open(entry_name, encoding='utf-8',
+                                  opener=lambda p, f: os.open(p, f, dir_fd=dir_fd)) as f:
+                            cp.read_file(f, source=desktop_file)
+                    else:
+                        cp.read(desktop_file, encoding='utf-8')
+
+                    name = cp.get('Desktop Entry', 'Name', fallback=None)
+                    exec_cmd = cp.get('Desktop Entry', 'Exec', fallback=None)
+
+                    # Skip hidden helpers and entries not meant to be
+                    # launched from a menu (MIME handlers etc.)
+                    if (cp.getboolean('Desktop Entry', 'NoDisplay', fallback=False)
+                            or cp.getboolean('Desktop Entry', 'Hidden', fallback=False)):
+                        continue
+                    entry_type = cp.get('Desktop Entry', 'Type', fallback='Application')
+                    if entry_type != 'Application':
+                        continue
+
+                    if name and exec_cmd:
                         apps.append({
-                            'name': app_name,
-                            'path': str(app_bundle),
-                            'aliases': [app_name.lower(), app_name.replace(' ', '').lower()]
+                            'name': name,
+                            'path': exec_cmd.split()[0],  # First part of exec command
+                            'aliases': [name.lower(), name.replace(' ', '').lower()]
                         })
-                    except Exception as e:
-                        logger.debug(f"Error processing {app_bundle}: {e}")
-            except Exception as e:
-                logger.error(f"Error searching {search_path}: {e}")
-        
-        # Add common macOS apps
-        common_apps = [
-            {'name': 'Safari', 'path': '/Applications/Safari.app', 'aliases': ['safari']},
-            {'name': 'Finder', 'path': '/System/Library/CoreServices/Finder.app', 'aliases': ['finder']},
-            {'name': 'Terminal', 'path': '/System/Applications/Utilities/Terminal.app', 'aliases': ['terminal']},
-            {'name': 'TextEdit', 'path': '/System/Applications/TextEdit.app', 'aliases': ['textedit', 'text edit']},
-            {'name': 'Calculator', 'path': '/System/Applications/Calculator.app', 'aliases': ['calculator', 'calc']},
-            {'name': 'Calendar', 'path': '/System/Applications/Calendar.app', 'aliases': ['calendar']},
-            {'name': 'Mail', 'path': '/System/Applications/Mail.app', 'aliases': ['mail', 'email']},
-        ]
-        
-        apps.extend(common_apps)
+                except Exception as e:
+                    logger.debug(f"Error processing {desktop_file}: {e}")
+        except Exception as e:
+            logger.error(f"Error searching {search_path}: {e}")
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
         return apps
-    
+
     def _discover_linux_apps(self) -> List[Dict]:
         """Discover Linux applications"""
-        apps = []
-        
-        # Common Linux application directories
-        search_paths = [
-            Path('/usr/share/applications'),
-            Path.home() / '.local' / 'share' / 'applications'
-        ]
-        
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-            
-            try:
-                # Search for .desktop files
-                for desktop_file in search_path.glob('*.desktop'):
-                    try:
-                        # Parse .desktop file
-                        with open(desktop_file, 'r') as f:
-                            content = f.read()
-                            
-                            # Extract Name and Exec
-                            name = None
-                            exec_cmd = None
-                            
-                            for line in content.split('\n'):
-                                if line.startswith('Name='):
-                                    name = line.split('=', 1)[1].strip()
-                                elif line.startswith('Exec='):
-                                    exec_cmd = line.split('=', 1)[1].strip()
-                            
-                            if name and exec_cmd:
-                                apps.append({
-                                    'name': name,
-                                    'path': exec_cmd.split()[0],  # First part of exec command
-                                    'aliases': [name.lower(), name.replace(' ', '').lower()]
-                                })
-                    except Exception as e:
-                        logger.debug(f"Error processing {desktop_file}: {e}")
-            except Exception as e:
-                logger.error(f"Error searching {search_path}: {e}")
-        
-        return apps
+        return self._dedup_apps(
+            self._scan_roots(self._scan_linux_root, self._search_paths())
+        )
     
     def save_apps(self, filename: str = "config/apps.json") -> bool:
         """
@@ -192,10 +344,21 @@ class AppDiscovery:
         try:
             filepath = Path(filename)
             filepath.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({'apps': self.apps}, f, indent=2)
-            
+
+            new_bytes = json_compat.dumps({'apps': self.apps}, indent=True)
+
+            # Skip the write (and its fsync) when nothing changed
+            if filepath.exists():
+                old_digest = hashlib.blake2b(filepath.read_bytes()).digest()
+                if old_digest == hashlib.blake2b(new_bytes).digest():
+                    logger.info(f"Apps unchanged, skipping write to {filename}")
+                    return True
+
+            # Atomic write: temp file in the same directory, then rename
+            tmp_path = filepath.with_suffix('.tmp')
+            tmp_path.write_bytes(new_bytes)
+            os.replace(tmp_path, filepath)
+
             logger.info(f"Saved {len(self.apps)} apps to {filename}")
             return True
         except Exception as e:
@@ -227,12 +390,26 @@ class AppDiscovery:
             List of matching apps
         """
         query = query.lower()
+
+        # Trigram index narrows candidates to apps sharing every query
+        # trigram; short queries fall back to the full linear scan
+        if self._trigrams is not None and len(query) >= 3:
+            candidates = None
+            for pos in range(len(query) - 2):
+                posting = self._trigrams.get(query[pos:pos + 3])
+                if not posting:
+                    return []
+                candidates = posting if candidates is None else candidates & posting
+            indices = sorted(candidates)
+        else:
+            indices = range(len(self.apps))
+
         matches = []
-        
-        for app in self.apps:
+        for index in indices:
+            app = self.apps[index]
             if query in app['name'].lower():
                 matches.append(app)
             elif any(query in alias for alias in app.get('aliases', [])):
                 matches.append(app)
-        
+
         return matches
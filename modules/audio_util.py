@@ -0,0 +1,48 @@
+"""
+Shared Audio Device Helpers for EchoOS
+Caches PortAudio device enumeration for preflight and troubleshooting
+"""
+
+import functools
+from typing import List, Tuple
+
+import sounddevice as sd
+
+
+@functools.lru_cache(maxsize=1)
+def query_devices():
+    """All devices from a single cached PortAudio scan
+
+    Enumeration can take hundreds of milliseconds on some hosts
+    (Windows MMDevice/WASAPI initialization), so one scan services
+    every caller in the process.
+    """
+    return sd.query_devices()
+
+
+@functools.lru_cache(maxsize=1)
+def default_input_device():
+    """Cached default input device info"""
+    return sd.query_devices(kind='input')
+
+
+@functools.lru_cache(maxsize=1)
+def input_devices() -> List[Tuple[int, str, int, float]]:
+    """Cached (index, name, input_channels, samplerate) tuples
+
+    The input-capable subset is filtered once from the cached scan;
+    callers index tuples positionally instead of repeating the
+    channel-count filter and per-device dict lookups.
+    """
+    return [
+        (i, d['name'], d['max_input_channels'], d['default_samplerate'])
+        for i, d in enumerate(query_devices())
+        if d['max_input_channels'] > 0
+    ]
+
+
+def invalidate():
+    """Drop cached results after sd.default.device changes"""
+    query_devices.cache_clear()
+    default_input_device.cache_clear()
+    input_devices.cache_clear()
@@ -5,123 +5,528 @@ Secure session management with encryption
 Falls back to password authentication if Resemblyzer unavailable
 """
 
+import atexit
+import hmac
+import importlib.util
+import json
+import os
 import pickle
 import hashlib
 import logging
+import secrets
 import pathlib
+import sqlite3
+import sys
+import threading
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
-from cryptography.fernet import Fernet
+import base64
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import sounddevice as sd
 
+from modules import json_compat
+
 logger = logging.getLogger(__name__)
 
-# Try to import Resemblyzer (optional dependency)
-try:
-    from resemblyzer import VoiceEncoder, preprocess_wav
-    RESEMBLYZER_AVAILABLE = True
+# Schema for the auth database; sessions are indexed on expiry so cleanup
+# only touches expired rows instead of rewriting a whole pickle file
+AUTH_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    expires_at INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+"""
+
+# Probe for Resemblyzer (optional dependency) without importing it —
+# the import pulls in PyTorch, which password-only sessions never need.
+# The actual import and model load happen lazily in _get_encoder().
+RESEMBLYZER_AVAILABLE = importlib.util.find_spec("resemblyzer") is not None
+if RESEMBLYZER_AVAILABLE:
     logger.info("Resemblyzer available - voice biometric authentication enabled")
-except ImportError:
-    RESEMBLYZER_AVAILABLE = False
+else:
     logger.warning("Resemblyzer not available - falling back to password authentication")
 
+# Try to import faiss (optional dependency) for large-user-base voice
+# matching; the quantized NumPy matmul below is the fallback
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Try to import argon2-cffi (optional dependency) for password hashing;
+# legacy SHA-256 hashes remain verifiable and migrate on successful login
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerifyMismatchError, InvalidHashError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+    logger.warning("argon2-cffi not available - falling back to SHA-256 password hashing")
+
 
 class Authenticator:
     """Voice biometric authentication system with password fallback"""
     
     def __init__(self, tts=None, users_file: str = "config/users.pkl",
-                 sessions_file: str = "config/sessions.pkl"):
+                 sessions_file: str = "config/sessions.pkl",
+                 db_file: str = "config/auth.db"):
         """
         Initialize authenticator
-        
+
         Args:
             tts: TTS instance for feedback
-            users_file: Path to users database
-            sessions_file: Path to sessions database
+            users_file: Path to legacy users pickle (migrated into db_file)
+            sessions_file: Path to legacy sessions pickle (migrated into db_file)
+            db_file: Path to sqlite auth database
         """
         self.tts = tts
         self.users_file = pathlib.Path(users_file)
         self.sessions_file = pathlib.Path(sessions_file)
+        self.db_file = pathlib.Path(db_file)
         self.current_user = None
         self.session_timeout = 30  # minutes
         
-        # Initialize voice encoder if available
-        if RESEMBLYZER_AVAILABLE:
+        # Voice encoder is constructed on first use (model weights take
+        # seconds to load); password auth and session checks skip it
+        self._encoder = None
+        self._preprocess_wav = None
+        self.voice_auth_enabled = RESEMBLYZER_AVAILABLE
+
+        # Single worker that runs preprocess + embedding off the calling
+        # thread, so spoken feedback overlaps the computation
+        self._embed_pool = ThreadPoolExecutor(max_workers=1)
+
+        # Deferred-write worker: last_login updates ride here so login
+        # returns before the disk write (shutdown drains pending writes)
+        self._write_pool = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self._write_pool.shutdown)
+
+        # Reused capture resources: one PortAudio stream kept open and
+        # per-length int16 buffers, so repeated recordings skip device
+        # open latency and reallocate nothing
+        self._stream = None
+        self._rec_buffers = {}
+        
+        # Password hashing (Argon2id when available, tuned to ~50 ms)
+        if ARGON2_AVAILABLE:
+            self._password_hasher = PasswordHasher(
+                time_cost=2, memory_cost=64 * 1024, parallelism=1
+            )
+        else:
+            self._password_hasher = None
+        # Hash verified against for unknown usernames (built on demand)
+        self._dummy_password_hash = None
+
+        # Encryption key for sessions (AES-GCM: single-pass AEAD that
+        # runs on AES-NI/NEON, unlike Fernet's AES-CBC + HMAC pair)
+        self.cipher_key = self._get_or_create_key()
+        self.cipher = AESGCM(self.cipher_key)
+
+        # Open auth database (WAL allows concurrent readers; the lock
+        # serializes writes from UI worker threads)
+        self._db_lock = threading.Lock()
+        self._db = self._open_db()
+        self._migrate_pickles()
+
+        # Load users; sessions are read lazily on first access since
+        # register/list flows never touch them
+        self.users = self._load_users()
+        self._sessions = None
+        self._rebuild_embedding_index()
+
+        logger.info(f"Authenticator initialized (Voice auth: {self.voice_auth_enabled})")
+
+    def _get_encoder(self):
+        """Import Resemblyzer and load the voice encoder on first use
+
+        Returns the cached encoder, or None if it cannot be initialized
+        (in which case voice auth is disabled for this session).
+        """
+        if self._encoder is None and self.voice_auth_enabled:
             try:
-                self.encoder = VoiceEncoder()
-                self.voice_auth_enabled = True
+                from resemblyzer import VoiceEncoder, preprocess_wav
+                import torch
+                # GRU forward pass is 5-10x faster on a GPU when present;
+                # embed_utterance still returns a numpy array either way
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                logger.info(f"Loading voice encoder model ({device})...")
+                self._encoder = VoiceEncoder(device=device)
+                self._preprocess_wav = preprocess_wav
                 logger.info("Voice encoder initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize voice encoder: {e}")
-                self.encoder = None
                 self.voice_auth_enabled = False
+        return self._encoder
+
+    def _embed_audio(self, encoder, audio_data: np.ndarray,
+                     robust: bool = False) -> np.ndarray:
+        """Compute the unit-norm voice embedding of a recording
+
+        Runs on self._embed_pool so callers can keep talking to the user
+        (TTS prompts, progress output) while the model crunches.
+
+        The capture is already fixed-rate 16 kHz mono and has passed the
+        RMS gate, so by default a cheap inline peak normalization
+        replaces preprocess_wav's VAD + resampling pass (~30-80 ms per
+        call); robust=True runs the full preprocessing for noisy mics.
+        """
+        if robust:
+            wav = self._preprocess_wav(audio_data)
         else:
-            self.encoder = None
-            self.voice_auth_enabled = False
-        
-        # Encryption key for sessions
-        self.cipher_key = self._get_or_create_key()
-        self.cipher = Fernet(self.cipher_key)
-        
-        # Load databases
-        self.users = self._load_users()
-        self.sessions = self._load_sessions()
-        
-        logger.info(f"Authenticator initialized (Voice auth: {self.voice_auth_enabled})")
+            wav = audio_data / max(float(np.max(np.abs(audio_data))), 1e-6)
+        embedding = encoder.embed_utterance(wav)
+        # Unit-norm contract: comparisons are then exact cosine
+        # similarity via a bare dot product
+        return (embedding / np.linalg.norm(embedding)).astype(np.float32)
+
+    def _rebuild_embedding_index(self):
+        """Stack enrolled voice embeddings into one matrix for comparison
+
+        authenticate() then scores a probe against all users with a single
+        matrix-vector product instead of a per-user Python loop. The matrix
+        is stored quantized to int8 with one scale per row — embeddings are
+        unit-norm, so the quantization error is far below the match
+        threshold, and the integer matmul halves bytes moved.
+        """
+        usernames = []
+        embeddings = []
+        for username, user_data in self.users.items():
+            if user_data.get('auth_type') != 'voice':
+                continue
+            embedding = user_data.get('embedding')
+            if embedding is None:
+                continue
+            usernames.append(username)
+            embeddings.append(embedding)
+
+        self._embedding_usernames = usernames
+        self._faiss_index = None
+        if embeddings:
+            matrix = np.ascontiguousarray(np.stack(embeddings), dtype=np.float32)
+            self._emb_scales = (127.0 / np.max(np.abs(matrix), axis=1)).astype(np.float32)
+            self._emb_q = np.ascontiguousarray(
+                (matrix * self._emb_scales[:, None]).round(), dtype=np.int8
+            )
+            if FAISS_AVAILABLE:
+                # Flat inner-product index: SIMD-blocked search that
+                # scales past what the hand-rolled matmul handles well
+                self._faiss_index = faiss.IndexFlatIP(matrix.shape[1])
+                self._faiss_index.add(matrix)
+        else:
+            self._emb_q = None
+            self._emb_scales = None
+
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the sqlite auth database, creating the schema if needed"""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(AUTH_DB_SCHEMA)
+        return db
+
+    def _migrate_pickles(self):
+        """One-time migration of legacy users/sessions pickles into sqlite"""
+        try:
+            if self.users_file.exists():
+                # Setup seeds a zero-byte sentinel meaning "no users";
+                # only a non-empty file carries an actual pickle
+                if self.users_file.stat().st_size == 0:
+                    users = {}
+                else:
+                    with open(self.users_file, 'rb') as f:
+                        users = pickle.load(f)
+                with self._db_lock:
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO users(username, data) VALUES (?, ?)",
+                        [(name, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                         for name, data in users.items()]
+                    )
+                    self._db.commit()
+                self.users_file.unlink()
+                logger.info(f"Migrated {len(users)} users from pickle to sqlite")
+        except Exception as e:
+            logger.error(f"Error migrating users pickle: {e}")
+
+        try:
+            if self.sessions_file.exists():
+                if self.sessions_file.stat().st_size == 0:
+                    sessions = {}
+                else:
+                    with open(self.sessions_file, 'rb') as f:
+                        sessions = pickle.load(f)
+                rows = []
+                for session_id, encrypted_data in sessions.items():
+                    try:
+                        session_data = self._decrypt_session(encrypted_data)
+                        expires_at = int(session_data['expires_at'].timestamp())
+                    except Exception:
+                        # Undecodable (including Fernet-era) sessions
+                        # expire immediately
+                        expires_at = 0
+                    rows.append((session_id, expires_at, encrypted_data))
+                with self._db_lock:
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO sessions(id, expires_at, data) VALUES (?, ?, ?)",
+                        rows
+                    )
+                    self._db.commit()
+                self.sessions_file.unlink()
+                logger.info(f"Migrated {len(rows)} sessions from pickle to sqlite")
+        except Exception as e:
+            logger.error(f"Error migrating sessions pickle: {e}")
     
     def _get_or_create_key(self) -> bytes:
-        """Get or create encryption key"""
-        key_file = pathlib.Path("config/.key")
+        """Get or create the 32-byte session encryption key
+
+        Legacy Fernet keys (44-byte urlsafe base64) are decoded to their
+        raw 32 bytes in place on first run. The key lives next to the
+        auth database, so tests pointing db_file at a temp directory
+        never touch the real config/.
+        """
+        key_file = self.db_file.parent / ".key"
         key_file.parent.mkdir(parents=True, exist_ok=True)
-        
+
         if key_file.exists():
-            return key_file.read_bytes()
+            key = key_file.read_bytes()
+            if len(key) != 32:  # Fernet-era base64 key
+                key = base64.urlsafe_b64decode(key)
+                key_file.write_bytes(key)
+            return key
         else:
-            key = Fernet.generate_key()
+            key = AESGCM.generate_key(bit_length=256)
             key_file.write_bytes(key)
             return key
+
+    def _encrypt_session(self, session_data: Dict) -> bytes:
+        """Serialize and encrypt a session record (nonce-prefixed AES-GCM)
+
+        Records are plain JSON rather than pickle: cheaper to serialize
+        and nothing executable to deserialize on a tamper path.
+        """
+        record = dict(session_data)
+        for key in ('created_at', 'expires_at'):
+            record[key] = record[key].isoformat()
+        payload = json_compat.dumps(record)
+        nonce = os.urandom(12)
+        return nonce + self.cipher.encrypt(nonce, payload, None)
+
+    def _decrypt_session(self, blob: bytes) -> Dict:
+        """Decrypt and deserialize a session record"""
+        payload = self.cipher.decrypt(blob[:12], blob[12:], None)
+        record = json_compat.loads(payload)
+        for key in ('created_at', 'expires_at'):
+            record[key] = datetime.fromisoformat(record[key])
+        return record
     
+    def _embedding_paths(self) -> Tuple[pathlib.Path, pathlib.Path]:
+        """Paths of the embedding matrix and its username order file"""
+        return (self.db_file.with_name('embeddings.npy'),
+                self.db_file.with_name('embeddings_users.json'))
+
     def _load_users(self) -> Dict:
-        """Load users database"""
+        """Load users database
+
+        User rows hold metadata only; voice embeddings live in a sidecar
+        .npy. Rows are copied out of a short-lived memory map rather
+        than kept as views: a live mapping holds the file open, and on
+        Windows os.replace in _save_embeddings fails against a mapped
+        file, silently dropping new enrollments.
+        """
         try:
-            if self.users_file.exists():
-                with open(self.users_file, 'rb') as f:
-                    return pickle.load(f)
+            rows = self._db.execute("SELECT username, data FROM users").fetchall()
+            users = {name: pickle.loads(data) for name, data in rows}
+
+            emb_path, idx_path = self._embedding_paths()
+            if emb_path.exists() and idx_path.exists():
+                matrix = np.load(emb_path, mmap_mode='r')
+                for index, name in enumerate(json.loads(idx_path.read_text())):
+                    if name in users:
+                        users[name]['embedding'] = np.array(matrix[index],
+                                                            copy=True)
+                # Drop the mapping now so the file handle closes before
+                # any later save tries to replace it
+                del matrix
+
+            self._normalize_embeddings(users)
+            return users
         except Exception as e:
             logger.error(f"Error loading users: {e}")
         return {}
-    
+
+    def _save_embeddings(self):
+        """Write the embedding matrix and username order to disk"""
+        usernames = [name for name, data in self.users.items()
+                     if data.get('embedding') is not None]
+        emb_path, idx_path = self._embedding_paths()
+        if usernames:
+            matrix = np.stack([np.asarray(self.users[name]['embedding'],
+                                          dtype=np.float32)
+                               for name in usernames])
+            # Write-then-rename so a crash mid-save never leaves a
+            # truncated matrix behind
+            tmp_path = emb_path.with_suffix('.npy.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, emb_path)
+            idx_path.write_text(json.dumps(usernames))
+            # Point in-memory rows at the freshly written matrix so
+            # they stay consistent with the on-disk order
+            for index, name in enumerate(usernames):
+                self.users[name]['embedding'] = matrix[index]
+        else:
+            emb_path.unlink(missing_ok=True)
+            idx_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _user_meta(user_data: Dict) -> Dict:
+        """User record without the embedding (stored separately)"""
+        return {key: value for key, value in user_data.items()
+                if key != 'embedding'}
+
+    def _normalize_embeddings(self, users: Dict):
+        """One-time migration: enforce unit-norm float32 embeddings"""
+        migrated = False
+        for user_data in users.values():
+            embedding = user_data.get('embedding')
+            if embedding is None:
+                continue
+            norm = np.linalg.norm(embedding)
+            if norm > 0 and (embedding.dtype != np.float32
+                             or not np.isclose(norm, 1.0, atol=1e-6)):
+                user_data['embedding'] = (embedding / norm).astype(np.float32)
+                migrated = True
+        if migrated:
+            self.users = users
+            self._save_users()
+            logger.info("Normalized stored voice embeddings to unit norm")
+
     def _save_users(self):
-        """Save users database"""
+        """Sync the in-memory users dict to the database"""
         try:
-            self.users_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.users_file, 'wb') as f:
-                pickle.dump(self.users, f)
+            with self._db_lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO users(username, data) VALUES (?, ?)",
+                    [(name, pickle.dumps(self._user_meta(data),
+                                         protocol=pickle.HIGHEST_PROTOCOL))
+                     for name, data in self.users.items()]
+                )
+                stored = [row[0] for row in
+                          self._db.execute("SELECT username FROM users")]
+                removed = [name for name in stored if name not in self.users]
+                if removed:
+                    self._db.executemany(
+                        "DELETE FROM users WHERE username = ?",
+                        [(name,) for name in removed]
+                    )
+                self._db.commit()
+            self._save_embeddings()
             logger.info("Users database saved")
         except Exception as e:
             logger.error(f"Error saving users: {e}")
-    
+
+    def _save_user(self, username: str):
+        """Upsert a single user row (for per-login metadata updates)"""
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO users(username, data) VALUES (?, ?)",
+                    (username, pickle.dumps(self._user_meta(self.users[username]),
+                                            protocol=pickle.HIGHEST_PROTOCOL))
+                )
+                self._db.commit()
+        except Exception as e:
+            logger.error(f"Error saving user {username}: {e}")
+
+    @property
+    def sessions(self) -> Dict:
+        """Session blobs keyed by id, loaded from the database on first use"""
+        if self._sessions is None:
+            self._sessions = self._load_sessions()
+        return self._sessions
+
     def _load_sessions(self) -> Dict:
         """Load sessions database"""
         try:
-            if self.sessions_file.exists():
-                with open(self.sessions_file, 'rb') as f:
-                    return pickle.load(f)
+            rows = self._db.execute("SELECT id, data FROM sessions").fetchall()
+            return {session_id: data for session_id, data in rows}
         except Exception as e:
             logger.error(f"Error loading sessions: {e}")
         return {}
     
-    def _save_sessions(self):
-        """Save sessions database"""
-        try:
-            self.sessions_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.sessions_file, 'wb') as f:
-                pickle.dump(self.sessions, f)
-        except Exception as e:
-            logger.error(f"Error saving sessions: {e}")
-    
+    def _hash_password(self, password: str) -> str:
+        """Hash a password (Argon2id, or SHA-256 if argon2 is unavailable)"""
+        if self._password_hasher is not None:
+            return self._password_hasher.hash(password)
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def _get_dummy_hash(self) -> str:
+        """Hash of a random secret, verified against for unknown usernames
+
+        Running the full KDF even when the account doesn't exist keeps
+        failed logins constant-time, closing the username-enumeration
+        timing channel.
+        """
+        if self._dummy_password_hash is None:
+            self._dummy_password_hash = self._hash_password(secrets.token_hex(16))
+        return self._dummy_password_hash
+
+    def _verify_password(self, username: str, password: str) -> bool:
+        """
+        Verify a password in constant time
+
+        Unknown usernames are checked against a dummy hash so the call
+        costs the same whether or not the account exists. Legacy SHA-256
+        hex hashes are still accepted and are transparently rehashed with
+        Argon2id on successful login.
+        """
+        stored = self.users.get(username, {}).get('password_hash')
+        known = stored is not None
+        if not known:
+            stored = self._get_dummy_hash()
+
+        if stored.startswith('$argon2') and self._password_hasher is not None:
+            try:
+                self._password_hasher.verify(stored, password)
+            except (VerifyMismatchError, InvalidHashError):
+                return False
+            if known and self._password_hasher.check_needs_rehash(stored):
+                self.users[username]['password_hash'] = self._password_hasher.hash(password)
+            return known
+
+        # Legacy SHA-256 record: constant-time compare, migrate if possible
+        legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+        if not hmac.compare_digest(legacy_hash, stored):
+            return False
+        if known and self._password_hasher is not None:
+            self.users[username]['password_hash'] = self._password_hasher.hash(password)
+        return known
+
+    def _get_stream(self, sample_rate: int):
+        """Lazily open (and keep open) one PortAudio input stream
+
+        Opening a capture device costs 50-200 ms on some hosts; reusing
+        the stream removes that from every recording after the first.
+        """
+        if self._stream is not None and self._stream.samplerate != sample_rate:
+            self._stream.close()
+            self._stream = None
+        if self._stream is None:
+            self._stream = sd.InputStream(
+                samplerate=sample_rate, channels=1, dtype='int16'
+            )
+        return self._stream
+
     def record_voice_sample(self, duration: int = 5, sample_rate: int = 16000) -> Optional[np.ndarray]:
         """
         Record voice sample for registration/authentication
@@ -142,42 +547,57 @@ class Authenticator:
         try:
             logger.info(f"Recording voice sample for {duration} seconds...")
             
-            # Give user time to prepare (don't use TTS as it might block)
+            # Give user time to prepare (don't use TTS as it might block);
+            # programmatic callers (tests, scripted retries) skip the pause
             print(f"\n{'='*60}")
             print(f"🎤 RECORDING IN 2 SECONDS...")
             print(f"Please speak clearly for {duration} seconds")
             print(f"{'='*60}\n")
-            
-            time.sleep(2)  # Give user time to prepare
-            
+
+            if sys.stdout.isatty() and not os.environ.get('ECHOOS_QUIET'):
+                time.sleep(2)  # Give user time to prepare
+
             print("🔴 RECORDING NOW - SPEAK!")
             
-            # Record audio
-            recording = sd.rec(
-                int(duration * sample_rate),
-                samplerate=sample_rate,
-                channels=1,
-                dtype='float32',
-                blocking=False
-            )
-            
-            # Wait for recording with progress indicator
-            for i in range(duration):
-                time.sleep(1)
-                print(f"  Recording... {i+1}/{duration} seconds")
-            
-            sd.wait()  # Ensure recording is complete
-            
+            # Record audio as int16 (half the capture bandwidth of float32;
+            # converted below since preprocess_wav expects float) into a
+            # pooled buffer through the persistent stream
+            stream = self._get_stream(sample_rate)
+            total_frames = int(duration * sample_rate)
+            buffer = self._rec_buffers.get(total_frames)
+            if buffer is None:
+                buffer = np.empty((total_frames, 1), dtype=np.int16)
+                self._rec_buffers[total_frames] = buffer
+
+            stream.start()
+            filled = 0
+            last_second = 0
+            while filled < total_frames:
+                chunk, _overflowed = stream.read(
+                    min(sample_rate // 4, total_frames - filled)
+                )
+                buffer[filled:filled + len(chunk)] = chunk
+                filled += len(chunk)
+                # Progress indicator once per captured second
+                second = filled // sample_rate
+                if second > last_second:
+                    last_second = second
+                    print(f"  Recording... {second}/{duration} seconds")
+            stream.stop()
+
             print("✅ Recording complete!\n")
+
+            # Copy out of the pooled buffer as 1D float32 in [-1, 1]
+            audio_data = buffer[:, 0].astype(np.float32) / 32768.0
             
-            # Flatten to 1D array
-            audio_data = recording.flatten()
-            
-            # Check if audio was actually recorded
-            max_level = np.max(np.abs(audio_data))
-            avg_level = np.mean(np.abs(audio_data))
-            
-            logger.info(f"Audio levels - Max: {max_level:.4f}, Avg: {avg_level:.4f}")
+            # Check if audio was actually recorded (abs once, reduce the
+            # result, instead of re-walking the buffer per statistic)
+            abs_data = np.abs(audio_data)
+            max_level = abs_data.max()
+            avg_level = abs_data.mean()
+            rms = float(np.sqrt(np.mean(np.square(audio_data))))
+
+            logger.info(f"Audio levels - Max: {max_level:.4f}, Avg: {avg_level:.4f}, RMS: {rms:.4f}")
             
             if max_level < 0.001:
                 logger.error("No audio detected - microphone may not be working")
@@ -190,6 +610,14 @@ class Authenticator:
                 print("\n   Run: python scripts/test_microphone.py")
                 return None
             
+            # Energy gate: rejecting silence here costs a few NumPy ops
+            # and saves the entire encoder forward pass downstream
+            if rms < 0.005:
+                logger.error(f"Silent sample rejected (RMS {rms:.4f})")
+                print("❌ ERROR: Recording was essentially silent")
+                print("   Please speak during the recording window")
+                return None
+
             if max_level < 0.01:
                 logger.warning("Audio levels very low - speak louder")
                 print("⚠️  WARNING: Audio levels are very low")
@@ -205,15 +633,18 @@ class Authenticator:
             print(f"   Run: python scripts/test_microphone.py")
             return None
     
-    def register_user(self, username: str, password: str = None, duration: int = 5) -> bool:
+    def register_user(self, username: str, password: str = None, duration: int = 5,
+                      num_samples: int = 3) -> bool:
         """
-        Register new user with voice sample or password
-        
+        Register new user with voice samples or password
+
         Args:
             username: Username to register
             password: Password (optional, for password auth)
             duration: Recording duration for voice auth
-            
+            num_samples: Voice samples to record; their embeddings are
+                averaged into a lower-variance template
+
         Returns:
             True if successful, False otherwise
         """
@@ -227,20 +658,32 @@ class Authenticator:
             if self.voice_auth_enabled and password is None:
                 print(f"\n📝 Registering user: {username}")
                 print("   Using voice biometric authentication")
-                
-                # Record voice sample
-                audio_data = self.record_voice_sample(duration)
-                if audio_data is None:
+
+                encoder = self._get_encoder()
+                if encoder is None:
+                    print("❌ Voice authentication not available")
                     return False
-                
-                # Preprocess audio
-                print("🔄 Processing voice sample...")
-                wav = preprocess_wav(audio_data)
-                
-                # Generate voice embedding
+
+                # Record several samples, embedding each in the background
+                # while the next is captured; the averaged template has
+                # much lower variance than a single take
+                embedding_futures = []
+                for sample_index in range(num_samples):
+                    print(f"   Sample {sample_index + 1}/{num_samples}")
+                    audio_data = self.record_voice_sample(duration)
+                    if audio_data is None:
+                        return False
+                    embedding_futures.append(self._embed_pool.submit(
+                        self._embed_audio, encoder, audio_data
+                    ))
+
                 print("🔄 Generating voice signature...")
-                embedding = self.encoder.embed_utterance(wav)
-                
+                if self.tts:
+                    self.tts.speak("Processing voice samples")
+                embedding = np.mean([future.result()
+                                     for future in embedding_futures], axis=0)
+                embedding = (embedding / np.linalg.norm(embedding)).astype(np.float32)
+
                 # Store user
                 self.users[username] = {
                     'embedding': embedding,
@@ -250,7 +693,8 @@ class Authenticator:
                 }
                 
                 self._save_users()
-                
+                self._rebuild_embedding_index()
+
                 logger.info(f"User {username} registered successfully (voice)")
                 print(f"✅ User '{username}' registered successfully!")
                 print("   You can now login using voice authentication")
@@ -259,8 +703,8 @@ class Authenticator:
             
             # Password authentication
             elif password:
-                password_hash = hashlib.sha256(password.encode()).hexdigest()
-                
+                password_hash = self._hash_password(password)
+
                 self.users[username] = {
                     'password_hash': password_hash,
                     'auth_type': 'password',
@@ -307,69 +751,81 @@ class Authenticator:
             return None
         
         try:
-            # Password authentication
+            # Password authentication (unknown usernames go through the
+            # same dummy-hash verification as wrong passwords, so neither
+            # timing nor the error message reveals which accounts exist)
             if username and password:
-                if username not in self.users:
-                    logger.warning(f"User {username} not found")
-                    print(f"❌ User '{username}' not found")
-                    return None
-                
-                user_data = self.users[username]
-                if user_data.get('auth_type') == 'password':
-                    password_hash = hashlib.sha256(password.encode()).hexdigest()
-                    if password_hash == user_data.get('password_hash'):
+                user_data = self.users.get(username)
+                if user_data is None or user_data.get('auth_type') == 'password':
+                    if self._verify_password(username, password):
                         self.current_user = username
                         self.users[username]['last_login'] = datetime.now()
-                        self._save_users()
+                        # Only this user's row changed (last_login, possibly
+                        # a migrated password hash) — upsert it off-thread
+                        # so login doesn't wait on the disk
+                        self._write_pool.submit(self._save_user, username)
                         self._create_session(username)
-                        
+
                         logger.info(f"User {username} authenticated (password)")
                         print(f"✅ Welcome {username}!")
                         return username
                     else:
-                        logger.warning("Invalid password")
-                        print("❌ Invalid password")
+                        logger.warning("Invalid username or password")
+                        print("❌ Invalid username or password")
                         return None
             
             # Voice authentication
             if self.voice_auth_enabled:
                 print(f"\n🔑 Voice Authentication")
                 print(f"   Registered users: {len(self.users)}")
-                
+
+                encoder = self._get_encoder()
+                if encoder is None:
+                    print("❌ Voice authentication not available")
+                    return None
+
                 audio_data = self.record_voice_sample(duration)
                 if audio_data is None:
                     return None
-                
-                # Preprocess audio
-                print("🔄 Processing voice sample...")
-                wav = preprocess_wav(audio_data)
-                
-                # Generate embedding
+
+                # Preprocess + embed in the background; the spoken prompt
+                # runs concurrently with the computation
                 print("🔄 Analyzing voice signature...")
-                test_embedding = self.encoder.embed_utterance(wav)
-                
-                # Compare with all users
+                embedding_future = self._embed_pool.submit(
+                    self._embed_audio, encoder, audio_data
+                )
+                if self.tts:
+                    self.tts.speak("Analyzing voice")
+                test_embedding = embedding_future.result()
+
+                # Compare with all users in one matrix-vector product
                 best_match = None
                 best_similarity = 0.0
-                
+
                 print("🔄 Comparing with registered users...")
-                for user, user_data in self.users.items():
-                    if user_data.get('auth_type') != 'voice':
-                        continue
-                    
-                    stored_embedding = user_data.get('embedding')
-                    if stored_embedding is None:
-                        continue
-                    
-                    similarity = np.dot(test_embedding, stored_embedding)
-                    
-                    logger.debug(f"Similarity with {user}: {similarity:.3f}")
-                    print(f"   {user}: {similarity:.3f}")
-                    
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = user
-                
+                if self._faiss_index is not None:
+                    # Embeddings are unit-norm, so inner product == cosine
+                    distances, indices = self._faiss_index.search(
+                        test_embedding.reshape(1, -1), 1
+                    )
+                    best_similarity = float(distances[0, 0])
+                    best_match = self._embedding_usernames[int(indices[0, 0])]
+                elif self._emb_q is not None:
+                    # Quantize the probe, integer matmul, then rescale to
+                    # recover cosine similarities
+                    test_scale = np.float32(127.0) / np.max(np.abs(test_embedding))
+                    test_q = (test_embedding * test_scale).round().astype(np.int32)
+                    raw = self._emb_q @ test_q
+                    similarities = raw / (self._emb_scales * test_scale)
+
+                    for user, similarity in zip(self._embedding_usernames, similarities):
+                        logger.debug(f"Similarity with {user}: {similarity:.3f}")
+                        print(f"   {user}: {similarity:.3f}")
+
+                    best_index = int(np.argmax(similarities))
+                    best_similarity = float(similarities[best_index])
+                    best_match = self._embedding_usernames[best_index]
+
                 # Check threshold
                 print(f"\n   Best match: {best_match} ({best_similarity:.3f})")
                 print(f"   Threshold: {threshold}")
@@ -377,8 +833,8 @@ class Authenticator:
                 if best_similarity >= threshold:
                     self.current_user = best_match
                     self.users[best_match]['last_login'] = datetime.now()
-                    self._save_users()
-                    
+                    self._write_pool.submit(self._save_user, best_match)
+
                     # Create session
                     self._create_session(best_match)
                     
@@ -404,18 +860,30 @@ class Authenticator:
     
     def _create_session(self, username: str):
         """Create encrypted session for user"""
-        session_id = hashlib.sha256(f"{username}{datetime.now()}".encode()).hexdigest()
+        # A random token is both faster and stronger than hashing
+        # username+timestamp; one clock read serves all three timestamps
+        session_id = secrets.token_hex(32)
+        now = datetime.now()
+        expires_at = now + timedelta(minutes=self.session_timeout)
         session_data = {
             'username': username,
-            'created_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(minutes=self.session_timeout)
+            'created_at': now,
+            'expires_at': expires_at
         }
-        
+
         # Encrypt session data
-        encrypted_data = self.cipher.encrypt(pickle.dumps(session_data))
+        encrypted_data = self._encrypt_session(session_data)
         self.sessions[session_id] = encrypted_data
-        self._save_sessions()
-        
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions(id, expires_at, data) VALUES (?, ?, ?)",
+                    (session_id, int(expires_at.timestamp()), encrypted_data)
+                )
+                self._db.commit()
+        except Exception as e:
+            logger.error(f"Error saving session: {e}")
+
         logger.info(f"Session created for {username}")
     
     def logout(self):
@@ -434,25 +902,19 @@ class Authenticator:
         return self.current_user
     
     def cleanup_expired_sessions(self):
-        """Remove expired sessions"""
-        now = datetime.now()
-        expired = []
-        
-        for session_id, encrypted_data in self.sessions.items():
-            try:
-                session_data = pickle.loads(self.cipher.decrypt(encrypted_data))
-                if session_data['expires_at'] < now:
-                    expired.append(session_id)
-            except Exception as e:
-                logger.error(f"Error checking session: {e}")
-                expired.append(session_id)
-        
-        for session_id in expired:
-            del self.sessions[session_id]
-        
-        if expired:
-            self._save_sessions()
-            logger.info(f"Cleaned up {len(expired)} expired sessions")
+        """Remove expired sessions (indexed delete, only expired rows)"""
+        try:
+            now_ts = int(datetime.now().timestamp())
+            with self._db_lock:
+                cursor = self._db.execute(
+                    "DELETE FROM sessions WHERE expires_at < ?", (now_ts,)
+                )
+                self._db.commit()
+            if cursor.rowcount:
+                self._sessions = None  # reloaded lazily on next access
+                logger.info(f"Cleaned up {cursor.rowcount} expired sessions")
+        except Exception as e:
+            logger.error(f"Error cleaning up sessions: {e}")
     
     def list_users(self) -> list:
         """Get list of registered users"""
@@ -463,6 +925,7 @@ class Authenticator:
         if username in self.users:
             del self.users[username]
             self._save_users()
+            self._rebuild_embedding_index()
             logger.info(f"User {username} deleted")
             print(f"✅ User '{username}' deleted")
             return True
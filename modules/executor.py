@@ -33,7 +33,19 @@ class Executor:
         self.auth = auth
         self.platform = platform.system()
         self.app_paths = self._load_app_paths()
-        
+
+        # Category -> handler table: execute() dispatches with one dict
+        # lookup instead of walking an if/elif chain per command
+        self._handlers = {
+            'system': self._execute_system,
+            'application': self._execute_application,
+            'file': self._execute_file,
+            'web': self._execute_web,
+            'system_info': self._execute_system_info,
+            'volume': self._execute_volume,
+            'control': self._execute_control,
+        }
+
         logger.info(f"Executor initialized for {self.platform}")
     
     def _load_app_paths(self) -> Dict:
@@ -50,6 +62,11 @@ class Executor:
             logger.error(f"Error loading app paths: {e}")
         return {}
     
+    def set_apps(self, apps: list):
+        """Update known application paths from discovery results"""
+        self.app_paths = {app['name'].lower(): app['path'] for app in apps}
+        logger.info(f"Executor app paths updated ({len(self.app_paths)} apps)")
+
     def _validate_filename(self, filename: str) -> bool:
         """
         Validate filename for security
@@ -96,26 +113,14 @@ class Executor:
         
         try:
             # Route to appropriate handler
-            if category == 'system':
-                return self._execute_system(intent, params)
-            elif category == 'application':
-                return self._execute_application(intent, params)
-            elif category == 'file':
-                return self._execute_file(intent, params)
-            elif category == 'web':
-                return self._execute_web(intent, params)
-            elif category == 'system_info':
-                return self._execute_system_info(intent, params)
-            elif category == 'volume':
-                return self._execute_volume(intent, params)
-            elif category == 'control':
-                return self._execute_control(intent, params)
-            else:
+            handler = self._handlers.get(category)
+            if handler is None:
                 logger.warning(f"Unknown category: {category}")
                 if self.tts:
                     self.tts.speak("Unknown command category")
                 return False
-                
+            return handler(intent, params)
+
         except Exception as e:
             logger.error(f"Error executing command: {e}", exc_info=True)
             if self.tts:
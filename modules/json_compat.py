@@ -0,0 +1,26 @@
+"""
+Shared JSON Helpers for EchoOS
+One home for the optional orjson import (C-accelerated, 3-10x faster)
+so every caller gets the same stdlib-json fallback behavior
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, 2-space indented when indent is set"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
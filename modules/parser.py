@@ -7,11 +7,74 @@ Uses fuzzy matching for robust command recognition
 import json
 import logging
 import pathlib
+import pickle
+import re
+from functools import partial
 from typing import Dict, Optional, Tuple, List
 from rapidfuzz import fuzz, process
 
+# Optional Aho-Corasick automaton for O(len(text)) exact matching;
+# the first-token bucket fallback below needs no extra dependency
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from modules import json_compat
+
 logger = logging.getLogger(__name__)
 
+# Schema version of the precompiled commands pickle (see initialize_config)
+COMMANDS_PKL_SCHEMA = 2
+
+# Parsed commands keyed by (path, source mtimes): repeated parser
+# construction in one process (tests, window respawns) reuses the dict
+# instead of re-reading and re-parsing the file
+_COMMANDS_CACHE: Dict[Tuple[str, Tuple[int, int]], Dict] = {}
+
+_DIGIT_RE = re.compile(r'\b(\d+)\b')
+
+
+def _extract_app(params_text: str) -> Dict:
+    return {'app_name': params_text}
+
+
+def _extract_url(params_text: str) -> Dict:
+    # Clean up website URL
+    return {'url': params_text.replace('www.', '').replace('.com', '')}
+
+
+def _extract_query(params_text: str) -> Dict:
+    return {'query': params_text}
+
+
+def _extract_filename(params_text: str) -> Dict:
+    return {'filename': params_text}
+
+
+def _extract_amount(params_text: str, default: int) -> Dict:
+    match = _DIGIT_RE.search(params_text)
+    return {'amount': int(match.group(1)) if match else default}
+
+
+# Intent → extractor dispatch table; _extract_parameters falls back to a
+# generic {'text': ...} for intents not listed here
+_PARAM_EXTRACTORS = {
+    'open': _extract_app,
+    'close': _extract_app,
+    'open_website': _extract_url,
+    'open_site': _extract_url,
+    'search_google': _extract_query,
+    'search_youtube': _extract_query,
+    'open_file': _extract_filename,
+    'create_file': _extract_filename,
+    'delete_file': _extract_filename,
+    'volume_up': partial(_extract_amount, default=10),
+    'volume_down': partial(_extract_amount, default=10),
+    'scroll_up': partial(_extract_amount, default=3),
+    'scroll_down': partial(_extract_amount, default=3),
+}
+
 
 class CommandParser:
     """Parses voice commands into actionable intents"""
@@ -28,16 +91,96 @@ class CommandParser:
         self.commands_file = pathlib.Path(commands_file)
         self.commands = self._load_commands()
         self.fuzzy_threshold = 70  # Minimum similarity score
-        
+        self._build_pattern_index()
+
         logger.info("Command parser initialized")
+
+    def _build_pattern_index(self):
+        """Flatten command patterns into parallel lists
+
+        Matching then scans one flat list (and hands the fuzzy pass to
+        rapidfuzz in a single C call) instead of walking the nested
+        category/intent dicts on every utterance.
+        """
+        self._flat_patterns: List[str] = []
+        self._pattern_meta: List[Tuple[str, str]] = []
+        for category, intents in self.commands.items():
+            for intent, patterns in intents.items():
+                for pattern in patterns:
+                    self._flat_patterns.append(pattern)
+                    self._pattern_meta.append((intent, category))
+
+        # Whole-utterance hits ("shutdown", "volume up") resolve with a
+        # single dict lookup before any prefix machinery runs; first
+        # definition of a duplicate pattern keeps priority
+        self._exact_index: Dict[str, int] = {}
+        for index, pattern in enumerate(self._flat_patterns):
+            self._exact_index.setdefault(pattern, index)
+
+        # Longest-prefix lookup: the longest pattern anchored at the
+        # start of the utterance wins, so "open website google" resolves
+        # to open_website rather than open + "website google"
+        self._automaton = None
+        if ahocorasick is not None and self._flat_patterns:
+            self._automaton = ahocorasick.Automaton()
+            for index, pattern in enumerate(self._flat_patterns):
+                # First definition of a duplicate pattern keeps priority
+                if not self._automaton.exists(pattern):
+                    self._automaton.add_word(pattern, (index, pattern))
+            self._automaton.make_automaton()
+        else:
+            # Bucket patterns by first token, longest first (stable sort
+            # keeps definition order among equal lengths)
+            self._prefix_buckets: Dict[str, List[int]] = {}
+            for index, pattern in enumerate(self._flat_patterns):
+                first_token = pattern.split(' ', 1)[0]
+                self._prefix_buckets.setdefault(first_token, []).append(index)
+            for bucket in self._prefix_buckets.values():
+                bucket.sort(key=lambda i: len(self._flat_patterns[i]),
+                            reverse=True)
     
     def _load_commands(self) -> Dict:
-        """Load command mappings from file"""
+        """Load command mappings from file
+
+        Prefers the precompiled pickle next to commands.json when it is
+        at least as new as the JSON (pickle deserializes faster); falls
+        back to the JSON source otherwise.
+        """
+        pkl_file = self.commands_file.with_suffix('.pkl')
+
+        def _mtime_ns(path):
+            try:
+                return path.stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        cache_key = (str(self.commands_file),
+                     (_mtime_ns(pkl_file), _mtime_ns(self.commands_file)))
+        cached_commands = _COMMANDS_CACHE.get(cache_key)
+        if cached_commands is not None:
+            return cached_commands
+
+        try:
+            if (pkl_file.exists() and self.commands_file.exists()
+                    and pkl_file.stat().st_mtime >= self.commands_file.stat().st_mtime):
+                with open(pkl_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('_schema') == COMMANDS_PKL_SCHEMA:
+                    commands = cached['data']
+                    logger.info(f"Loaded {len(commands)} command categories (pickle)")
+                    _COMMANDS_CACHE[cache_key] = commands
+                    return commands
+        except Exception as e:
+            logger.debug(f"Error loading commands pickle: {e}")
+
         try:
             if self.commands_file.exists():
-                with open(self.commands_file, 'r', encoding='utf-8') as f:
-                    commands = json.load(f)
+                # Bytes in, orjson when available — skips the text
+                # decoding pass stdlib json would do
+                raw = self.commands_file.read_bytes()
+                commands = json_compat.loads(raw)
                 logger.info(f"Loaded {len(commands)} command categories")
+                _COMMANDS_CACHE[cache_key] = commands
                 return commands
         except Exception as e:
             logger.error(f"Error loading commands: {e}")
@@ -82,29 +225,50 @@ class CommandParser:
         Returns:
             Tuple of (intent, category, parameters) or None
         """
-        best_match = None
-        best_score = 0
-        
-        # Iterate through all command categories
-        for category, intents in self.commands.items():
-            for intent, patterns in intents.items():
-                for pattern in patterns:
-                    # Check if pattern matches start of text
-                    if text.startswith(pattern):
-                        # Extract parameters (text after pattern)
-                        params_text = text[len(pattern):].strip()
-                        params = self._extract_parameters(intent, params_text)
-                        return (intent, category, params)
-                    
-                    # Fuzzy matching
-                    score = fuzz.partial_ratio(pattern, text)
-                    if score > best_score and score >= self.fuzzy_threshold:
-                        best_score = score
-                        params_text = text.replace(pattern, '').strip()
-                        params = self._extract_parameters(intent, params_text)
-                        best_match = (intent, category, params)
-        
-        return best_match
+        # Exact whole-utterance match: one hash lookup, no parameters
+        index = self._exact_index.get(text)
+        if index is not None:
+            intent, category = self._pattern_meta[index]
+            return (intent, category, self._extract_parameters(intent, ''))
+
+        # Exact longest-prefix match
+        if self._automaton is not None:
+            best_index = None
+            best_len = 0
+            for end, (index, pattern) in self._automaton.iter(text):
+                if end + 1 == len(pattern) and len(pattern) > best_len:
+                    best_index, best_len = index, len(pattern)
+            if best_index is not None:
+                intent, category = self._pattern_meta[best_index]
+                params_text = text[best_len:].strip()
+                params = self._extract_parameters(intent, params_text)
+                return (intent, category, params)
+        else:
+            first_token = text.split(' ', 1)[0]
+            for index in self._prefix_buckets.get(first_token, ()):
+                pattern = self._flat_patterns[index]
+                if text.startswith(pattern):
+                    intent, category = self._pattern_meta[index]
+                    # Extract parameters (text after pattern)
+                    params_text = text[len(pattern):].strip()
+                    params = self._extract_parameters(intent, params_text)
+                    return (intent, category, params)
+
+        # Fuzzy matching: one C-level scan over all patterns at once
+        match = process.extractOne(
+            text,
+            self._flat_patterns,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=self.fuzzy_threshold
+        )
+        if match:
+            pattern, _score, index = match
+            intent, category = self._pattern_meta[index]
+            params_text = text.replace(pattern, '').strip()
+            params = self._extract_parameters(intent, params_text)
+            return (intent, category, params)
+
+        return None
     
     def _extract_parameters(self, intent: str, params_text: str) -> Dict:
         """
@@ -117,51 +281,15 @@ class CommandParser:
         Returns:
             Dictionary of parameters
         """
-        params = {}
-        
         if not params_text:
-            return params
-        
-        # Intent-specific parameter extraction
-        if intent in ['open', 'close']:
-            params['app_name'] = params_text
-        
-        elif intent in ['open_website', 'open_site']:
-            # Clean up website URL
-            url = params_text.replace('www.', '').replace('.com', '')
-            params['url'] = url
-        
-        elif intent in ['search_google', 'search_youtube']:
-            params['query'] = params_text
-        
-        elif intent in ['open_file', 'create_file', 'delete_file']:
-            params['filename'] = params_text
-        
-        elif intent in ['volume_up', 'volume_down']:
-            # Try to extract percentage
-            words = params_text.split()
-            for word in words:
-                if word.isdigit():
-                    params['amount'] = int(word)
-                    break
-            if 'amount' not in params:
-                params['amount'] = 10  # Default
-        
-        elif intent in ['scroll_up', 'scroll_down']:
-            # Extract scroll amount
-            words = params_text.split()
-            for word in words:
-                if word.isdigit():
-                    params['amount'] = int(word)
-                    break
-            if 'amount' not in params:
-                params['amount'] = 3  # Default
-        
-        else:
+            return {}
+
+        # Intent-specific parameter extraction via dispatch table
+        extractor = _PARAM_EXTRACTORS.get(intent)
+        if extractor is None:
             # Generic parameter
-            params['text'] = params_text
-        
-        return params
+            return {'text': params_text}
+        return extractor(params_text)
     
     def get_command_suggestions(self, partial_text: str, limit: int = 5) -> List[str]:
         """
@@ -174,21 +302,17 @@ class CommandParser:
         Returns:
             List of suggested commands
         """
-        all_patterns = []
-        
-        for category, intents in self.commands.items():
-            for intent, patterns in intents.items():
-                all_patterns.extend(patterns)
-        
-        # Use fuzzy matching to find similar commands
+        # Use fuzzy matching to find similar commands; the cutoff is
+        # applied inside rapidfuzz rather than filtering afterwards
         matches = process.extract(
             partial_text,
-            all_patterns,
+            self._flat_patterns,
             scorer=fuzz.partial_ratio,
-            limit=limit
+            limit=limit,
+            score_cutoff=60
         )
-        
-        return [match[0] for match in matches if match[1] >= 60]
+
+        return [match[0] for match in matches]
     
     def add_command(self, category: str, intent: str, patterns: List[str]) -> bool:
         """
@@ -211,7 +335,14 @@ class CommandParser:
             # Save to file
             with open(self.commands_file, 'w', encoding='utf-8') as f:
                 json.dump(self.commands, f, indent=2)
-            
+
+            # Keep the precompiled pickle in sync with the JSON
+            with open(self.commands_file.with_suffix('.pkl'), 'wb') as f:
+                pickle.dump({'_schema': COMMANDS_PKL_SCHEMA, 'data': self.commands}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+            self._build_pattern_index()
+
             logger.info(f"Added command: {category}.{intent}")
             return True
             
@@ -226,4 +357,5 @@ class CommandParser:
     def reload_commands(self):
         """Reload commands from file"""
         self.commands = self._load_commands()
+        self._build_pattern_index()
         logger.info("Commands reloaded")
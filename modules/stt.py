@@ -4,16 +4,53 @@ Offline speech recognition using Vosk
 Cross-platform support for Windows and macOS
 """
 
-import json
 import logging
-import queue
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
-from typing import Optional, Callable
+from typing import Callable, List, Optional
 import pathlib
 
 logger = logging.getLogger(__name__)
 
+# Optional VAD gate: silent blocks then skip the acoustic model entirely
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# Shared optional-orjson loads for the per-block result parsing in the
+# recognition loop; bound to a module name so the hot path stays a
+# plain global lookup
+from modules.json_compat import loads as _loads
+
+# Audio blocks buffered between the realtime callback and the consumer
+RING_SLOTS = 32
+
+# Requested capture latency; PortAudio's default suggestion sits around
+# 30 ms on Linux, and an explicit 10 ms pushes it into the low-latency
+# path (set PA_MIN_LATENCY_MSEC=10 in the environment to match). The
+# device clamps this to whatever it can actually deliver.
+CAPTURE_LATENCY_S = 0.010
+
+# Vosk Model construction takes seconds and the object is immutable, so
+# loaded models are shared across VoskManager instances by path
+_MODEL_CACHE = {}
+
+# WebRTC VAD operates on 30 ms frames; a block counts as speech when at
+# least this fraction of its frames are voiced
+VAD_FRAME_MS = 30
+VAD_VOICED_FRACTION = 0.1
+
+# recognize_once recordings at least this long are split on silence and
+# decoded in parallel; gaps shorter than the padding merge segments
+PARALLEL_DECODE_MIN_S = 30
+SEGMENT_PAD_FRAMES = 10  # 300 ms of context around each voiced run
+
 
 class VoskManager:
     """Manages Vosk speech recognition"""
@@ -30,13 +67,40 @@ class VoskManager:
         self.model_path = pathlib.Path(model_path)
         self.model = None
         self.recognizer = None
-        self.audio_queue = queue.Queue()
         self.is_listening = False
         self.callback = None
         self.sample_rate = 16000
-        
-        self._load_model()
-    
+        # 200 ms blocks: Vosk rechunks to 200 ms internally, so larger
+        # blocks only add buffering delay before the first partial
+        self.blocksize = 3200
+
+        # Lock-free SPSC ring between the PortAudio callback (producer)
+        # and the consumer loop: a preallocated int16 slab plus head/tail
+        # counters, so the realtime thread never locks or allocates.
+        # head is written only by the callback, tail only by the consumer.
+        self._ring = np.zeros((RING_SLOTS, self.blocksize), dtype=np.int16)
+        self._ring_lens = [0] * RING_SLOTS
+        self._ring_head = 0
+        self._ring_tail = 0
+
+        # VAD gate state (aggressiveness 2 is a good speech/noise tradeoff)
+        self.vad = webrtcvad.Vad(2) if webrtcvad is not None else None
+        self._in_speech = False
+
+        # LocalAgreement-2 state: tokens seen identically in two
+        # consecutive partials are confirmed once and never re-emitted
+        self._confirmed: List[str] = []
+        self._prev_partial: List[str] = []
+        self._partial_counter = 0
+        # Cached so the hot loop skips partial bookkeeping entirely when
+        # nobody is listening at DEBUG; refreshed per start_listening
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Load the model in the background so construction returns in
+        # milliseconds; anything that needs the model waits on the event
+        self._model_ready = threading.Event()
+        threading.Thread(target=self._load_model, daemon=True).start()
+
     def _load_model(self):
         """Load Vosk model"""
         try:
@@ -44,22 +108,55 @@ class VoskManager:
                 logger.error(f"Vosk model not found at {self.model_path}")
                 logger.info("Please download the model using: python scripts/download_vosk_model.py")
                 return False
-            
-            logger.info(f"Loading Vosk model from {self.model_path}...")
-            self.model = Model(str(self.model_path))
+
+            key = str(self.model_path)
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                logger.info(f"Loading Vosk model from {self.model_path}...")
+                model = Model(key)
+                _MODEL_CACHE[key] = model
+            else:
+                logger.info(f"Reusing cached Vosk model for {self.model_path}")
+            self.model = model
+            # No SetWords(True): nothing downstream reads per-word
+            # timings, and enabling them makes every result serialize a
+            # word-level JSON array
             self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
             logger.info("Vosk model loaded successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to load Vosk model: {e}")
             return False
+        finally:
+            # Set even on failure so waiters see the outcome immediately
+            # instead of sitting out their timeout
+            self._model_ready.set()
     
     def audio_callback(self, indata, frames, time, status):
-        """Callback for audio stream"""
+        """Realtime callback: copy the block into the ring, no locks"""
         if status:
             logger.warning(f"Audio callback status: {status}")
-        self.audio_queue.put(bytes(indata))
+        head = self._ring_head
+        if head - self._ring_tail >= RING_SLOTS:
+            # Consumer stalled; drop the block rather than stall the
+            # realtime thread
+            return
+        slot = head % RING_SLOTS
+        block = np.frombuffer(indata, dtype=np.int16)
+        self._ring[slot, :len(block)] = block
+        self._ring_lens[slot] = len(block)
+        self._ring_head = head + 1
+
+    def _block_has_speech(self, data: bytes) -> bool:
+        """Check a block for voiced 30 ms frames via WebRTC VAD"""
+        frame_bytes = 2 * (self.sample_rate * VAD_FRAME_MS // 1000)
+        frames = voiced = 0
+        for start in range(0, len(data) - frame_bytes + 1, frame_bytes):
+            frames += 1
+            if self.vad.is_speech(data[start:start + frame_bytes],
+                                  self.sample_rate):
+                voiced += 1
+        return frames == 0 or voiced >= frames * VAD_VOICED_FRACTION
     
     def start_listening(self, callback: Callable[[str], None]):
         """
@@ -68,6 +165,7 @@ class VoskManager:
         Args:
             callback: Function to call with recognized text
         """
+        self._model_ready.wait()
         if not self.model:
             logger.error("Cannot start listening: Model not loaded")
             if self.tts:
@@ -76,35 +174,80 @@ class VoskManager:
         
         self.callback = callback
         self.is_listening = True
-        
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Best effort: realtime scheduling keeps the consumer loop from
+        # being preempted mid-block; unprivileged processes usually get
+        # refused, which is fine
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+        except (AttributeError, PermissionError, OSError):
+            pass
+
         try:
             with sd.RawInputStream(
                 samplerate=self.sample_rate,
-                blocksize=8000,
+                blocksize=self.blocksize,
                 dtype='int16',
                 channels=1,
+                latency=CAPTURE_LATENCY_S,
                 callback=self.audio_callback
             ):
                 logger.info("Started listening for speech...")
                 if self.tts:
                     self.tts.speak("Listening")
-                
+
+                # Bind once: shaves the attribute lookups off every
+                # iteration of the hot loop
+                recognizer = self.recognizer
+
                 while self.is_listening:
-                    data = self.audio_queue.get()
-                    
-                    if self.recognizer.AcceptWaveform(data):
-                        result = json.loads(self.recognizer.Result())
+                    if self._ring_tail == self._ring_head:
+                        time.sleep(0.005)
+                        continue
+                    slot = self._ring_tail % RING_SLOTS
+                    # tobytes() copies, so the slot is free for the
+                    # producer as soon as tail advances
+                    data = self._ring[slot, :self._ring_lens[slot]].tobytes()
+                    self._ring_tail += 1
+
+                    # VAD gate: don't run the acoustic model on silence;
+                    # on trailing silence flush the utterance immediately
+                    # instead of waiting for Vosk's internal endpointer
+                    if self.vad is not None:
+                        if not self._block_has_speech(data):
+                            if self._in_speech:
+                                self._in_speech = False
+                                result = _loads(recognizer.FinalResult())
+                                text = result.get('text', '').strip()
+                                self._confirmed = []
+                                self._prev_partial = []
+                                if text and self.callback:
+                                    logger.info(f"Recognized: {text}")
+                                    self.callback(text)
+                            continue
+                        self._in_speech = True
+
+                    if recognizer.AcceptWaveform(data):
+                        result = _loads(recognizer.Result())
                         text = result.get('text', '').strip()
-                        
+                        self._confirmed = []
+                        self._prev_partial = []
+
                         if text and self.callback:
                             logger.info(f"Recognized: {text}")
                             self.callback(text)
                     else:
-                        # Partial result (optional)
-                        partial = json.loads(self.recognizer.PartialResult())
+                        # PartialResult makes Vosk reserialize the
+                        # lattice on every call; every 3rd block
+                        # (~600 ms) is plenty for a progress hint
+                        self._partial_counter += 1
+                        if not self._debug or self._partial_counter % 3:
+                            continue
+                        partial = _loads(recognizer.PartialResult())
                         partial_text = partial.get('partial', '')
                         if partial_text:
-                            logger.debug(f"Partial: {partial_text}")
+                            self._update_partial(partial_text)
         
         except Exception as e:
             logger.error(f"Error during speech recognition: {e}")
@@ -114,6 +257,35 @@ class VoskManager:
         
         return True
     
+    def _update_partial(self, partial_text: str):
+        """Track the growing partial hypothesis LocalAgreement-2 style
+
+        Vosk re-emits the whole hypothesis on every partial. Tokens that
+        appear identically in two consecutive partials are treated as
+        confirmed and never emitted again; only the still-unstable tail
+        is logged when it actually changes, so a ten-word utterance logs
+        each word roughly once instead of re-logging the full prefix
+        fifty times.
+        """
+        tokens = partial_text.split()
+
+        # Extend the confirmed prefix with tokens agreed across the last
+        # two partials
+        agreed = 0
+        for current, previous in zip(tokens, self._prev_partial):
+            if current != previous:
+                break
+            agreed += 1
+        if agreed > len(self._confirmed):
+            newly = tokens[len(self._confirmed):agreed]
+            self._confirmed = tokens[:agreed]
+            logger.debug("Confirmed: %s", ' '.join(newly))
+
+        tail = tokens[len(self._confirmed):]
+        if tail and tail != self._prev_partial[len(self._confirmed):]:
+            logger.debug("Partial: %s", ' '.join(tail))
+        self._prev_partial = tokens
+
     def stop_listening(self):
         """Stop listening for speech"""
         self.is_listening = False
@@ -131,6 +303,7 @@ class VoskManager:
         Returns:
             Recognized text or None
         """
+        self._model_ready.wait()
         if not self.model:
             logger.error("Model not loaded")
             return None
@@ -148,10 +321,31 @@ class VoskManager:
                 dtype='int16'
             )
             sd.wait()
-            
-            # Recognize
-            self.recognizer.AcceptWaveform(recording.tobytes())
-            result = json.loads(self.recognizer.FinalResult())
+
+            # Long recordings: split on silence and decode the segments
+            # in parallel instead of one monolithic serial pass
+            if self.vad is not None and duration >= PARALLEL_DECODE_MIN_S:
+                text = self._recognize_segments(recording.reshape(-1))
+                logger.info(f"Recognized: {text}")
+                return text if text else None
+
+            # Fresh decoder state per utterance so lattice state from a
+            # previous call can't bleed in; Reset is cheap, and even the
+            # fallback rebuilds only the recognizer, never the Model
+            try:
+                self.recognizer.Reset()
+            except AttributeError:
+                self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
+
+            # Hand the recording buffer straight to the recognizer —
+            # AcceptWaveform takes any buffer-protocol object, so the
+            # tobytes() copy (~160 KB for 5 s) is unnecessary; fall back
+            # to a copy for Vosk builds that insist on bytes
+            try:
+                self.recognizer.AcceptWaveform(memoryview(recording).cast('b'))
+            except TypeError:
+                self.recognizer.AcceptWaveform(recording.tobytes())
+            result = _loads(self.recognizer.FinalResult())
             text = result.get('text', '').strip()
             
             logger.info(f"Recognized: {text}")
@@ -161,6 +355,50 @@ class VoskManager:
             logger.error(f"Error in recognize_once: {e}")
             return None
     
-    def is_model_loaded(self) -> bool:
-        """Check if model is loaded"""
+    def _recognize_segments(self, audio: np.ndarray) -> str:
+        """Decode VAD-located voiced segments of a long recording in parallel
+
+        The shared Model is thread-safe; each worker builds its own
+        lightweight KaldiRecognizer. Segment boundaries fall on silence,
+        so joining the per-segment results in order loses no words.
+        """
+        frame = self.sample_rate * VAD_FRAME_MS // 1000
+        voiced = [
+            index
+            for index in range((len(audio) - frame) // frame + 1)
+            if self.vad.is_speech(
+                audio[index * frame:(index + 1) * frame].tobytes(),
+                self.sample_rate
+            )
+        ]
+        if not voiced:
+            return ''
+
+        # Group voiced frames into segments, merging gaps shorter than
+        # the padding window
+        segments = []
+        start = prev = voiced[0]
+        for index in voiced[1:]:
+            if index - prev > SEGMENT_PAD_FRAMES:
+                segments.append((start, prev))
+                start = index
+            prev = index
+        segments.append((start, prev))
+
+        def decode(segment):
+            first, last = segment
+            lo = max(0, first - SEGMENT_PAD_FRAMES) * frame
+            hi = min(len(audio), (last + 1 + SEGMENT_PAD_FRAMES) * frame)
+            recognizer = KaldiRecognizer(self.model, self.sample_rate)
+            recognizer.AcceptWaveform(audio[lo:hi].tobytes())
+            return _loads(recognizer.FinalResult()).get('text', '').strip()
+
+        with ThreadPoolExecutor(max_workers=min(4, len(segments))) as pool:
+            texts = list(pool.map(decode, segments))
+        return ' '.join(text for text in texts if text)
+
+    def is_model_loaded(self, timeout: float = 0.0) -> bool:
+        """Check if model is loaded, optionally waiting for the preload"""
+        if timeout:
+            self._model_ready.wait(timeout)
         return self.model is not None
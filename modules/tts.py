@@ -6,6 +6,7 @@ Cross-platform support for Windows and macOS
 
 import pyttsx3
 import logging
+import queue
 import threading
 from typing import Optional
 
@@ -26,8 +27,15 @@ class TTS:
         self.rate = rate
         self.volume = volume
         self.engine = None
-        self._lock = threading.Lock()
         self._initialize_engine()
+
+        # One long-lived worker drains the speech queue: speak() becomes
+        # a non-blocking enqueue, there is no per-utterance thread
+        # creation, and only the worker ever drives the engine (pyttsx3
+        # is not re-entrant)
+        self._tx = queue.Queue(maxsize=32)
+        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+        self._worker_thread.start()
     
     def _initialize_engine(self):
         """Initialize the pyttsx3 engine"""
@@ -39,9 +47,12 @@ class TTS:
             # Try to set a better voice if available
             voices = self.engine.getProperty('voices')
             if voices:
-                # Prefer female voice for better clarity
+                # Prefer female voice for better clarity; lowercase each
+                # name once (macOS can report 50+ voices)
+                preferred = ('zira', 'female')
                 for voice in voices:
-                    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                    name = voice.name.lower()
+                    if any(tag in name for tag in preferred):
                         self.engine.setProperty('voice', voice.id)
                         break
             
@@ -60,29 +71,31 @@ class TTS:
         """
         if not text or not self.engine:
             return
-        
-        try:
-            with self._lock:
-                if blocking:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                else:
-                    # Non-blocking speech in separate thread
-                    thread = threading.Thread(target=self._speak_async, args=(text,))
-                    thread.daemon = True
-                    thread.start()
-            
-            logger.debug(f"TTS: {text}")
-        except Exception as e:
-            logger.error(f"TTS error: {e}")
-    
-    def _speak_async(self, text: str):
-        """Speak text asynchronously"""
+
+        done = threading.Event() if blocking else None
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            logger.error(f"Async TTS error: {e}")
+            self._tx.put_nowait((text, done))
+        except queue.Full:
+            logger.warning(f"TTS queue full - dropping: {text}")
+            return
+
+        if done is not None:
+            done.wait()
+        logger.debug(f"TTS: {text}")
+
+    def _worker(self):
+        """Drain queued utterances on the dedicated speech thread"""
+        while True:
+            text, done = self._tx.get()
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+                self._tx.task_done()
     
     def stop(self):
         """Stop current speech"""
@@ -6,13 +6,16 @@ Cross-platform support for Windows and macOS
 
 import logging
 import threading
+from datetime import datetime
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTextEdit, QGroupBox, QLineEdit,
     QMessageBox, QStatusBar
 )
-from PySide6.QtCore import Qt, Signal, QObject, QTimer
-from PySide6.QtGui import QFont, QIcon
+from PySide6.QtCore import (
+    Qt, Signal, Slot, QObject, QTimer, QThread, QMetaObject, Q_ARG
+)
+from PySide6.QtGui import QFont, QIcon, QTextCursor
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,92 @@ class SignalEmitter(QObject):
     update_status = Signal(str)
     update_log = Signal(str)
     command_recognized = Signal(str)
+    auth_changed = Signal(bool, str)
+
+
+class DiscoveryWorker(QObject):
+    """Runs app discovery on a QThread so the window shows immediately"""
+    finished = Signal(list)
+
+    def __init__(self, app_discovery):
+        super().__init__()
+        self.app_discovery = app_discovery
+
+    def run(self):
+        """Discover and persist apps, then report the result"""
+        try:
+            apps = self.app_discovery.discover_and_save()
+        except Exception as e:
+            logger.error(f"Background app discovery failed: {e}")
+            apps = []
+        self.finished.emit(apps)
+
+
+class ActionWorker(QObject):
+    """Runs long auth/listen operations on one persistent QThread
+
+    Button handlers dispatch here with a queued invocation instead of
+    spawning an ad-hoc threading.Thread per click; results come back to
+    the GUI thread through the window's SignalEmitter.
+    """
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+
+    @Slot(str)
+    def register(self, username: str):
+        """Record a voice sample and register the user"""
+        signals = self.window.signals
+        success = self.window.auth.register_user(username, duration=5)
+        if success:
+            signals.update_status.emit(f"User {username} registered!")
+            signals.update_log.emit(f"✓ User {username} registered successfully")
+        else:
+            signals.update_status.emit("Registration failed")
+            signals.update_log.emit("✗ Registration failed")
+
+    @Slot()
+    def authenticate(self):
+        """Authenticate by voice and report the outcome"""
+        signals = self.window.signals
+        username = self.window.auth.authenticate(duration=3, threshold=0.75)
+        if username:
+            signals.update_status.emit(f"Authenticated as {username}")
+            signals.update_log.emit(f"✓ Authenticated as {username}")
+            signals.auth_changed.emit(True, username)
+        else:
+            signals.update_status.emit("Authentication failed")
+            signals.update_log.emit("✗ Authentication failed")
+
+    @Slot()
+    def listen(self):
+        """Run the speech recognition loop until stop_listening"""
+        window = self.window
+        window.stt_manager.start_listening(window._on_speech_recognized)
+
+    @Slot(str)
+    def execute(self, text: str):
+        """Parse and execute a recognized command"""
+        window = self.window
+        signals = window.signals
+        signals.update_log.emit(f"Recognized: {text}")
+
+        command = window.parser.parse(text)
+
+        if command:
+            signals.update_log.emit(
+                f"Command: {command['category']}.{command['intent']}"
+            )
+            success = window.executor.execute(command)
+            if success:
+                signals.update_log.emit("✓ Command executed successfully")
+            else:
+                signals.update_log.emit("✗ Command execution failed")
+        else:
+            signals.update_log.emit("✗ Command not recognized")
+            if window.tts:
+                window.tts.speak("Command not recognized")
 
 
 class EchoMainWindow(QMainWindow):
@@ -48,7 +137,34 @@ class EchoMainWindow(QMainWindow):
         self.signals.update_status.connect(self._update_status_label)
         self.signals.update_log.connect(self._append_log)
         self.signals.command_recognized.connect(self._handle_command)
-        
+        self.signals.auth_changed.connect(self._on_auth_changed)
+
+        # One long-lived worker thread owns the blocking auth/listen
+        # operations; widget state only ever changes on the GUI thread
+        self._worker_thread = QThread(self)
+        self._worker = ActionWorker(self)
+        self._worker.moveToThread(self._worker_thread)
+        self._worker_thread.start()
+
+        # Command execution gets its own thread: the listen slot
+        # occupies the auth/listen worker for as long as recognition
+        # runs, so commands queued behind it would never execute
+        self._command_thread = QThread(self)
+        self._command_worker = ActionWorker(self)
+        self._command_worker.moveToThread(self._command_thread)
+        self._command_thread.start()
+
+        # Coalesced GUI updates: producers stash text here and a timer
+        # flushes it, so a flood of recognition messages costs one
+        # layout/repaint per tick instead of one per message
+        self._log_pending = []
+        self._status_pending = None
+        self._ui_lock = threading.Lock()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush_updates)
+        self._flush_timer.start()
+
         # Setup UI
         self._setup_ui()
         
@@ -167,6 +283,9 @@ class EchoMainWindow(QMainWindow):
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setMaximumHeight(200)
+        # Bound the document: old blocks drop in O(1), so append cost
+        # and memory stay constant over long sessions
+        self.log_text.document().setMaximumBlockCount(1000)
         log_layout.addWidget(self.log_text)
         
         # Clear log button
@@ -191,27 +310,47 @@ class EchoMainWindow(QMainWindow):
         self._append_log("EchoOS initialized. Please authenticate to start.")
     
     def _update_status_label(self, text: str):
-        """Update status label (thread-safe)"""
-        self.status_label.setText(text)
-        
-        # Color based on status
-        if "listening" in text.lower():
-            self.status_label.setStyleSheet("padding: 10px; background-color: #e3f2fd; border-radius: 5px;")
-        elif "error" in text.lower() or "failed" in text.lower():
-            self.status_label.setStyleSheet("padding: 10px; background-color: #ffebee; border-radius: 5px;")
-        else:
-            self.status_label.setStyleSheet("padding: 10px; background-color: #e8f5e9; border-radius: 5px;")
-    
+        """Record the latest status; the flush timer applies it once"""
+        with self._ui_lock:
+            self._status_pending = text
+
     def _append_log(self, text: str):
-        """Append to log (thread-safe)"""
-        self.log_text.append(f"[{self._get_timestamp()}] {text}")
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        """Queue a log line (thread-safe); flushed in batches"""
+        with self._ui_lock:
+            self._log_pending.append(f"[{self._get_timestamp()}] {text}")
+
+    def _flush_updates(self):
+        """Apply pending log/status updates in one repaint"""
+        with self._ui_lock:
+            if not self._log_pending and self._status_pending is None:
+                return
+            pending, self._log_pending = self._log_pending, []
+            status, self._status_pending = self._status_pending, None
+
+        if status is not None:
+            self.status_label.setText(status)
+            # Color based on status
+            if "listening" in status.lower():
+                self.status_label.setStyleSheet("padding: 10px; background-color: #e3f2fd; border-radius: 5px;")
+            elif "error" in status.lower() or "failed" in status.lower():
+                self.status_label.setStyleSheet("padding: 10px; background-color: #ffebee; border-radius: 5px;")
+            else:
+                self.status_label.setStyleSheet("padding: 10px; background-color: #e8f5e9; border-radius: 5px;")
+
+        if pending:
+            self.log_text.moveCursor(QTextCursor.End)
+            self.log_text.insertPlainText('\n'.join(pending) + '\n')
+            scrollbar = self.log_text.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
     
+    def _on_apps_discovered(self, apps: list):
+        """Handle completion of background app discovery"""
+        self.executor.set_apps(apps)
+        self.apps_status.setText(f"App discovery: {len(apps)} apps found")
+        self._append_log(f"App discovery finished ({len(apps)} apps)")
+
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
-        from datetime import datetime
         return datetime.now().strftime("%H:%M:%S")
     
     def _register_user(self):
@@ -225,58 +364,41 @@ class EchoMainWindow(QMainWindow):
         if ok and username:
             self._append_log(f"Registering user: {username}")
             self.signals.update_status.emit("Recording voice sample...")
-            
-            # Run in thread to avoid blocking UI
-            def register():
-                success = self.auth.register_user(username, duration=5)
-                if success:
-                    self.signals.update_status.emit(f"User {username} registered!")
-                    self.signals.update_log.emit(f"✓ User {username} registered successfully")
-                else:
-                    self.signals.update_status.emit("Registration failed")
-                    self.signals.update_log.emit("✗ Registration failed")
-            
-            thread = threading.Thread(target=register)
-            thread.start()
+
+            # Queued invocation runs on the worker thread, not the GUI
+            QMetaObject.invokeMethod(
+                self._worker, "register", Qt.QueuedConnection,
+                Q_ARG(str, username)
+            )
     
     def _authenticate_user(self):
         """Authenticate user by voice"""
         self._append_log("Starting voice authentication...")
         self.signals.update_status.emit("Authenticating...")
-        
-        def authenticate():
-            username = self.auth.authenticate(duration=3, threshold=0.75)
-            if username:
-                self.is_authenticated = True
-                self.signals.update_status.emit(f"Authenticated as {username}")
-                self.signals.update_log.emit(f"✓ Authenticated as {username}")
-                
-                # Update UI
-                self.user_label.setText(f"Logged in as: {username}")
-                self.user_label.setStyleSheet("font-weight: bold; color: #388e3c;")
-                self.start_btn.setEnabled(True)
-                self.logout_btn.setEnabled(True)
-                self.login_btn.setEnabled(False)
-                self.register_btn.setEnabled(False)
-            else:
-                self.signals.update_status.emit("Authentication failed")
-                self.signals.update_log.emit("✗ Authentication failed")
-        
-        thread = threading.Thread(target=authenticate)
-        thread.start()
+
+        QMetaObject.invokeMethod(
+            self._worker, "authenticate", Qt.QueuedConnection
+        )
+
+    def _on_auth_changed(self, authenticated: bool, username: str):
+        """Apply authentication state to the widgets (GUI thread)"""
+        self.is_authenticated = authenticated
+        if authenticated:
+            self.user_label.setText(f"Logged in as: {username}")
+            self.user_label.setStyleSheet("font-weight: bold; color: #388e3c;")
+        else:
+            self.user_label.setText("Not authenticated")
+            self.user_label.setStyleSheet("font-weight: bold; color: #d32f2f;")
+        self.start_btn.setEnabled(authenticated)
+        self.logout_btn.setEnabled(authenticated)
+        self.login_btn.setEnabled(not authenticated)
+        self.register_btn.setEnabled(not authenticated)
     
     def _logout_user(self):
         """Logout current user"""
         self.auth.logout()
-        self.is_authenticated = False
-        
-        self.user_label.setText("Not authenticated")
-        self.user_label.setStyleSheet("font-weight: bold; color: #d32f2f;")
-        self.start_btn.setEnabled(False)
-        self.logout_btn.setEnabled(False)
-        self.login_btn.setEnabled(True)
-        self.register_btn.setEnabled(True)
-        
+        self._on_auth_changed(False, "")
+
         self._append_log("Logged out")
         self.signals.update_status.emit("Logged out")
     
@@ -286,7 +408,9 @@ class EchoMainWindow(QMainWindow):
             QMessageBox.warning(self, "Not Authenticated", "Please authenticate first")
             return
         
-        if not self.stt_manager.is_model_loaded():
+        # Give the background model preload a moment to finish before
+        # declaring the model missing
+        if not self.stt_manager.is_model_loaded(timeout=2.0):
             QMessageBox.critical(self, "Model Not Loaded", 
                                "Vosk model not loaded. Please download the model first.")
             return
@@ -297,13 +421,10 @@ class EchoMainWindow(QMainWindow):
         
         self._append_log("Started listening for voice commands")
         self.signals.update_status.emit("🎤 Listening...")
-        
-        # Start listening in thread
-        def listen():
-            self.stt_manager.start_listening(self._on_speech_recognized)
-        
-        thread = threading.Thread(target=listen, daemon=True)
-        thread.start()
+
+        QMetaObject.invokeMethod(
+            self._worker, "listen", Qt.QueuedConnection
+        )
     
     def _stop_listening(self):
         """Stop voice recognition"""
@@ -321,26 +442,16 @@ class EchoMainWindow(QMainWindow):
         self.signals.command_recognized.emit(text)
     
     def _handle_command(self, text: str):
-        """Handle recognized command"""
-        self._append_log(f"Recognized: {text}")
-        
-        # Parse command
-        command = self.parser.parse(text)
-        
-        if command:
-            self._append_log(f"Command: {command['category']}.{command['intent']}")
-            
-            # Execute command
-            success = self.executor.execute(command)
-            
-            if success:
-                self._append_log("✓ Command executed successfully")
-            else:
-                self._append_log("✗ Command execution failed")
-        else:
-            self._append_log("✗ Command not recognized")
-            if self.tts:
-                self.tts.speak("Command not recognized")
+        """Dispatch a recognized command to the command worker
+
+        Parsing is cheap but the executor launches subprocesses and does
+        file I/O; running it off the GUI thread keeps the window
+        responsive during execution.
+        """
+        QMetaObject.invokeMethod(
+            self._command_worker, "execute", Qt.QueuedConnection,
+            Q_ARG(str, text)
+        )
     
     def _execute_manual_command(self):
         """Execute manually typed command"""
@@ -353,6 +464,13 @@ class EchoMainWindow(QMainWindow):
         """Handle window close"""
         if self.is_listening:
             self._stop_listening()
-        
+
+        # stop_listening unblocks the worker's listen loop, so the
+        # threads can drain and exit
+        self._worker_thread.quit()
+        self._command_thread.quit()
+        self._worker_thread.wait(2000)
+        self._command_thread.wait(2000)
+
         logger.info("Main window closed")
         event.accept()
@@ -3,13 +3,14 @@ Application Discovery Utility
 Scans system for installed applications and updates apps.json
 """
 
+import os
 import sys
-import json
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from modules import json_compat
 from modules.app_discovery import AppDiscovery
 
 
@@ -28,8 +29,9 @@ def main():
         # Initialize app discovery
         discovery = AppDiscovery()
         
-        # Discover applications
-        apps = discovery.discover_applications()
+        # Discover applications (roots are scanned concurrently and the
+        # result is cached by AppDiscovery)
+        apps = discovery.discover_apps()
         
         print(f"✓ Found {len(apps)} applications")
         print()
@@ -49,8 +51,20 @@ def main():
         config_dir.mkdir(exist_ok=True)
         
         apps_file = config_dir / "apps.json"
-        with open(apps_file, 'w') as f:
-            json.dump({"apps": apps}, f, indent=2)
+        payload = json_compat.dumps({"apps": apps}, indent=True)
+
+        # Anchor the write on one directory handle where the platform
+        # supports it: openat() skips re-resolving the config/ path
+        if os.open in os.supports_dir_fd:
+            dir_fd = os.open(config_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                with open(apps_file.name, 'wb',
+                          opener=lambda p, f: os.open(p, f, dir_fd=dir_fd)) as f:
+                    f.write(payload)
+            finally:
+                os.close(dir_fd)
+        else:
+            apps_file.write_bytes(payload)
         
         print("=" * 60)
         print(f"✓ Application database saved to {apps_file}")
@@ -4,61 +4,309 @@ Automated Model Downloader for EchoOS
 Downloads required models for speech recognition and voice authentication
 """
 
+import hashlib
 import os
+import shutil
+import struct
 import sys
+import threading
+import time
 import zipfile
+import zlib
 import tarfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
+# Optional SIMD-accelerated DEFLATE (2-3x faster than zlib on the
+# ~40 MB model zip); zipfile's own extraction is the fallback. CRC32
+# also prefers libdeflate's CLMUL implementation where the binding
+# exposes it.
+try:
+    import libdeflate
+    _crc32 = getattr(libdeflate, 'crc32', zlib.crc32)
+except ImportError:
+    libdeflate = None
+    _crc32 = zlib.crc32
 
-def download_file(url: str, destination: Path, description: str = "file") -> bool:
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import json_compat
+
+# 1 MiB chunks: far fewer write syscalls than the old 8 KiB blocks
+DOWNLOAD_CHUNK = 1 << 20
+
+# Progress repaints are rate-limited; per-chunk printing dominated CPU
+# on fast links
+PROGRESS_INTERVAL_S = 0.25
+
+# Files at least this large download over several parallel Range
+# streams (single-connection TCP rarely saturates a WAN link); smaller
+# ones are not worth the extra requests
+PARALLEL_STREAMS = 4
+PARALLEL_MIN_BYTES = 8 << 20
+
+_session = None
+
+
+def _get_session() -> requests.Session:
+    """Shared pooled session so downloads reuse one TLS connection"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+def _print_progress(downloaded: int, total_size: int):
+    """Render the progress bar for the current byte count"""
+    percent = (downloaded / total_size) * 100
+    bar_length = 50
+    filled = int(bar_length * downloaded / total_size)
+    bar = '█' * filled + '-' * (bar_length - filled)
+    print(f'\r[{bar}] {percent:.1f}% ({downloaded}/{total_size} bytes)', end='')
+
+
+def _download_parallel(url: str, destination: Path, total_size: int):
+    """Fetch disjoint byte ranges concurrently into a preallocated file
+
+    Each worker owns one Range request and pwrites at its own offsets,
+    so no locking is needed around the file; only the shared progress
+    counter takes a lock.
+    """
+    session = _get_session()
+    progress = {'downloaded': 0, 'last_paint': 0.0}
+    progress_lock = threading.Lock()
+
+    fd = os.open(str(destination), os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # Reserve the full size up front so concurrent writes never
+        # extend the file
+        try:
+            os.posix_fallocate(fd, 0, total_size)
+        except (AttributeError, OSError):
+            os.truncate(fd, total_size)
+
+        span = -(-total_size // PARALLEL_STREAMS)
+
+        def fetch(start: int):
+            end = min(start + span, total_size) - 1
+            response = session.get(
+                url, stream=True,
+                headers={'Range': f'bytes={start}-{end}'}
+            )
+            response.raise_for_status()
+            if response.status_code != 206:
+                # Server ignored the Range header and sent the full
+                # body; letting every worker pwrite it at its own
+                # offset would corrupt the file, so bail out to the
+                # serial fallback in download_file
+                response.close()
+                raise IOError(
+                    f"server ignored Range request "
+                    f"(got {response.status_code}, expected 206)"
+                )
+            offset = start
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                if chunk:
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+                    with progress_lock:
+                        progress['downloaded'] += len(chunk)
+                        now = time.monotonic()
+                        if now - progress['last_paint'] >= PROGRESS_INTERVAL_S:
+                            progress['last_paint'] = now
+                            _print_progress(progress['downloaded'], total_size)
+
+        with ThreadPoolExecutor(max_workers=PARALLEL_STREAMS) as pool:
+            futures = [pool.submit(fetch, start)
+                       for start in range(0, total_size, span)]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
+
+    _print_progress(total_size, total_size)
+
+
+def download_file(url: str, destination: Path, description: str = "file",
+                  expected_sha256: Optional[str] = None) -> bool:
     """
     Download file with progress bar
-    
+
+    Resumes a partial download via an HTTP Range request when the
+    destination already exists, and verifies the SHA-256 in the same
+    streaming pass when a digest is given.
+
     Args:
         url: URL to download from
         destination: Destination file path
         description: Description for progress display
-        
+        expected_sha256: Optional hex digest to verify against
+
     Returns:
         True if successful, False otherwise
     """
     try:
         print(f"\nDownloading {description}...")
         print(f"URL: {url}")
-        
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 8192
-        downloaded = 0
-        
+
         destination.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(destination, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=block_size):
+
+        # Resume an interrupted download instead of refetching it
+        resume_from = destination.stat().st_size if destination.exists() else 0
+
+        # Large range-capable files: several parallel streams saturate
+        # the link far sooner than one TCP flow
+        if not resume_from:
+            try:
+                head = _get_session().head(url, allow_redirects=True)
+                total_size = int(head.headers.get('content-length', 0))
+                if (head.headers.get('Accept-Ranges') == 'bytes'
+                        and total_size >= PARALLEL_MIN_BYTES):
+                    _download_parallel(url, destination, total_size)
+                    if expected_sha256:
+                        hasher = hashlib.sha256()
+                        with open(destination, 'rb') as f:
+                            for block in iter(lambda: f.read(DOWNLOAD_CHUNK), b''):
+                                hasher.update(block)
+                        if hasher.hexdigest() != expected_sha256:
+                            print(f"\n✗ Checksum mismatch for {description}")
+                            destination.unlink(missing_ok=True)
+                            return False
+                    print(f"\n✓ Downloaded {description} successfully")
+                    return True
+            except Exception as e:
+                # Any parallel failure falls back to the serial path
+                print(f"\nParallel download unavailable ({e}); "
+                      f"falling back to a single stream")
+                destination.unlink(missing_ok=True)
+
+        headers = {'Range': f'bytes={resume_from}-'} if resume_from else {}
+
+        response = _get_session().get(url, stream=True, headers=headers)
+        if resume_from and response.status_code == 416:
+            # Range not satisfiable: the file is already complete (e.g.
+            # a retry after an interruption between download and
+            # extraction); just verify it if a digest was given
+            response.close()
+            if expected_sha256:
+                hasher = hashlib.sha256()
+                with open(destination, 'rb') as f:
+                    for block in iter(lambda: f.read(DOWNLOAD_CHUNK), b''):
+                        hasher.update(block)
+                if hasher.hexdigest() != expected_sha256:
+                    print(f"\n✗ Checksum mismatch for {description}")
+                    destination.unlink(missing_ok=True)
+                    return False
+            print(f"✓ {description} already downloaded")
+            return True
+        if resume_from and response.status_code != 206:
+            # Server ignored the Range header; start over
+            resume_from = 0
+        response.raise_for_status()
+
+        hasher = hashlib.sha256() if expected_sha256 else None
+        if hasher is not None and resume_from:
+            # Fold the already-downloaded prefix into the digest
+            with open(destination, 'rb') as f:
+                for block in iter(lambda: f.read(DOWNLOAD_CHUNK), b''):
+                    hasher.update(block)
+
+        total_size = int(response.headers.get('content-length', 0)) + resume_from
+        downloaded = resume_from
+        if resume_from:
+            print(f"Resuming at {resume_from} bytes")
+
+        last_paint = 0.0
+        with open(destination, 'ab' if resume_from else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK):
                 if chunk:
                     f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
                     downloaded += len(chunk)
-                    
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        bar_length = 50
-                        filled = int(bar_length * downloaded / total_size)
-                        bar = '█' * filled + '-' * (bar_length - filled)
-                        print(f'\r[{bar}] {percent:.1f}% ({downloaded}/{total_size} bytes)', end='')
-        
+
+                    now = time.monotonic()
+                    if total_size > 0 and now - last_paint >= PROGRESS_INTERVAL_S:
+                        last_paint = now
+                        _print_progress(downloaded, total_size)
+
+        if total_size > 0:
+            _print_progress(downloaded, total_size)
+
+        if hasher is not None and hasher.hexdigest() != expected_sha256:
+            print(f"\n✗ Checksum mismatch for {description}")
+            destination.unlink(missing_ok=True)
+            return False
+
         print(f"\n✓ Downloaded {description} successfully")
         return True
-        
+
     except Exception as e:
         print(f"\n✗ Error downloading {description}: {e}")
         return False
 
 
+def _extract_zip_libdeflate(archive_path: Path, extract_to: Path):
+    """Extract a zip by feeding raw DEFLATE streams to libdeflate
+
+    The local file header layout is fixed by the zip format, so each
+    entry's compressed payload can be read straight off disk and
+    decompressed in one call instead of through zlib's streaming path.
+    Entries with unusual compression fall back to zipfile per entry.
+    """
+    with zipfile.ZipFile(archive_path) as zip_ref, \
+            open(archive_path, 'rb') as raw:
+        for info in zip_ref.infolist():
+            # Same traversal guard extractall applies
+            parts = info.filename.split('/')
+            if info.filename.startswith('/') or '..' in parts:
+                continue
+            target = extract_to / info.filename
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            if info.compress_type == zipfile.ZIP_DEFLATED:
+                raw.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', raw.read(4))
+                raw.seek(name_len + extra_len, os.SEEK_CUR)
+                payload = raw.read(info.compress_size)
+                data = libdeflate.deflate_decompress(payload, info.file_size)
+                if _crc32(data) != info.CRC:
+                    raise ValueError(f"Bad CRC-32 for file {info.filename!r}")
+                with open(target, 'wb') as dst:
+                    dst.write(data)
+            elif info.compress_type == zipfile.ZIP_STORED:
+                raw.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', raw.read(4))
+                raw.seek(name_len + extra_len, os.SEEK_CUR)
+                remaining = info.file_size
+                crc = 0
+                with open(target, 'wb') as dst:
+                    while remaining:
+                        chunk = raw.read(min(remaining, 1 << 20))
+                        if not chunk:
+                            break
+                        # zlib here: the libdeflate binding's crc32 is
+                        # one-shot, not incremental
+                        crc = zlib.crc32(chunk, crc)
+                        dst.write(chunk)
+                        remaining -= len(chunk)
+                if crc != info.CRC:
+                    raise ValueError(f"Bad CRC-32 for file {info.filename!r}")
+            else:
+                with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
+
 def extract_archive(archive_path: Path, extract_to: Path) -> bool:
     """
     Extract zip or tar.gz archive
@@ -76,8 +324,11 @@ def extract_archive(archive_path: Path, extract_to: Path) -> bool:
         extract_to.mkdir(parents=True, exist_ok=True)
         
         if archive_path.suffix == '.zip':
-            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_to)
+            if libdeflate is not None:
+                _extract_zip_libdeflate(archive_path, extract_to)
+            else:
+                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                    zip_ref.extractall(extract_to)
         elif archive_path.name.endswith('.tar.gz') or archive_path.name.endswith('.tgz'):
             with tarfile.open(archive_path, 'r:gz') as tar_ref:
                 tar_ref.extractall(extract_to)
@@ -130,33 +381,46 @@ def download_vosk_model() -> bool:
     return True
 
 
-def setup_resemblyzer() -> bool:
-    """Setup Resemblyzer for voice authentication"""
+def _write_json(path: Path, data):
+    """Write pretty-printed JSON, via orjson when available"""
+    path.write_bytes(json_compat.dumps(data, indent=True))
+
+
+def setup_resemblyzer(deep_check: bool = False) -> bool:
+    """Setup Resemblyzer for voice authentication
+
+    Presence is probed via installed metadata; actually constructing a
+    VoiceEncoder pulls in torch and its model weights, so that sanity
+    check only runs when --deep-check is passed.
+    """
     print("\n" + "=" * 60)
     print("Setting up Resemblyzer Voice Authentication")
     print("=" * 60)
-    
+
+    from importlib.metadata import PackageNotFoundError, distribution
+
     try:
-        # Try to import resemblyzer
-        import resemblyzer
-        print("✓ Resemblyzer already installed")
-        
-        # Test if model can be loaded
-        from resemblyzer import VoiceEncoder
-        encoder = VoiceEncoder()
-        print("✓ Resemblyzer model loaded successfully")
-        return True
-        
-    except ImportError:
+        distribution('resemblyzer')
+    except PackageNotFoundError:
         print("⚠ Resemblyzer not installed")
         print("\nTo enable voice authentication, install resemblyzer:")
         print("  pip install resemblyzer")
         print("\nNote: Voice authentication will be disabled without it")
         return False
-    except Exception as e:
-        print(f"⚠ Resemblyzer installed but model loading failed: {e}")
-        print("Voice authentication may not work properly")
-        return False
+
+    print("✓ Resemblyzer installed")
+
+    if deep_check:
+        try:
+            from resemblyzer import VoiceEncoder
+            VoiceEncoder()
+            print("✓ Resemblyzer model loaded successfully")
+        except Exception as e:
+            print(f"⚠ Resemblyzer installed but model loading failed: {e}")
+            print("Voice authentication may not work properly")
+            return False
+
+    return True
 
 
 def create_config_files() -> bool:
@@ -171,7 +435,6 @@ def create_config_files() -> bool:
     # Create commands.json if not exists
     commands_file = config_dir / "commands.json"
     if not commands_file.exists():
-        import json
         default_commands = {
             "system": {
                 "shutdown": ["shutdown", "shut down", "power off"],
@@ -214,29 +477,34 @@ def create_config_files() -> bool:
                 "wake_up": ["wake up", "start listening", "resume", "hello echo"]
             }
         }
-        commands_file.write_text(json.dumps(default_commands, indent=2))
+        _write_json(commands_file, default_commands)
         print(f"✓ Created {commands_file}")
+
+        # Precompiled form the parser loads instead of re-parsing the
+        # JSON on every launch (schema must match parser.COMMANDS_PKL_SCHEMA)
+        import pickle
+        with open(commands_file.with_suffix('.pkl'), 'wb') as f:
+            pickle.dump({'_schema': 2, 'data': default_commands}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"✓ Created {commands_file.with_suffix('.pkl')}")
     
     # Create apps.json
     apps_file = config_dir / "apps.json"
     if not apps_file.exists():
-        import json
-        apps_file.write_text(json.dumps({"apps": []}, indent=2))
+        _write_json(apps_file, {"apps": []})
         print(f"✓ Created {apps_file}")
     
-    # Create user database
-    import pickle
+    # Create user database (zero-byte sentinel = no legacy users; the
+    # auth migration treats empty as an empty dict)
     users_file = config_dir / "users.pkl"
     if not users_file.exists():
-        with open(users_file, "wb") as f:
-            pickle.dump({}, f)
+        users_file.touch()
         print(f"✓ Created {users_file}")
-    
+
     # Create sessions database
     sessions_file = config_dir / "sessions.pkl"
     if not sessions_file.exists():
-        with open(sessions_file, "wb") as f:
-            pickle.dump({}, f)
+        sessions_file.touch()
         print(f"✓ Created {sessions_file}")
     
     print("\n✓ Configuration files created successfully")
@@ -256,8 +524,8 @@ def main():
         print("\n✗ Failed to download Vosk model")
         success = False
     
-    # Setup Resemblyzer (optional)
-    setup_resemblyzer()
+    # Setup Resemblyzer (optional); --deep-check also loads the encoder
+    setup_resemblyzer(deep_check='--deep-check' in sys.argv)
     
     # Create config files
     if not create_config_files():
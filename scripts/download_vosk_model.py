@@ -5,6 +5,8 @@ Downloads the small English model for offline speech recognition
 
 import os
 import sys
+import time
+import urllib.error
 import urllib.request
 import zipfile
 from pathlib import Path
@@ -14,6 +16,51 @@ MODEL_URL = "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip
 MODEL_NAME = "vosk-model-small-en-us-0.15"
 MODELS_DIR = Path("models")
 
+# 1 MiB read chunks; progress repaints rate-limited to 4/s
+DOWNLOAD_CHUNK = 1 << 20
+PROGRESS_INTERVAL_S = 0.25
+
+
+def _fetch(url: str, destination: Path):
+    """Stream url into destination, resuming a partial file if present"""
+    resume_from = destination.stat().st_size if destination.exists() else 0
+    request = urllib.request.Request(url)
+    if resume_from:
+        request.add_header('Range', f'bytes={resume_from}-')
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if resume_from and e.code == 416:
+            # Requested range not satisfiable: file already complete
+            return
+        raise
+
+    if resume_from and response.status != 206:
+        # Server ignored the Range header; start over
+        resume_from = 0
+
+    total_size = int(response.headers.get('Content-Length', 0)) + resume_from
+    downloaded = resume_from
+    if resume_from:
+        print(f"Resuming at {resume_from} bytes")
+
+    last_paint = 0.0
+    with response, open(destination, 'ab' if resume_from else 'wb') as f:
+        while True:
+            chunk = response.read(DOWNLOAD_CHUNK)
+            if not chunk:
+                break
+            f.write(chunk)
+            downloaded += len(chunk)
+
+            now = time.monotonic()
+            if total_size > 0 and now - last_paint >= PROGRESS_INTERVAL_S:
+                last_paint = now
+                percent = int(downloaded * 100 / total_size)
+                sys.stdout.write(f"\rProgress: {percent}% ")
+                sys.stdout.flush()
+
 
 def download_model():
     """Download and extract Vosk model"""
@@ -40,15 +87,20 @@ def download_model():
     print()
     
     try:
-        def progress_hook(count, block_size, total_size):
-            """Show download progress"""
-            percent = int(count * block_size * 100 / total_size)
-            sys.stdout.write(f"\rProgress: {percent}% ")
-            sys.stdout.flush()
-        
-        urllib.request.urlretrieve(MODEL_URL, zip_path, progress_hook)
+        # Prefer the pooled/parallel downloader when requests is
+        # importable; _fetch is the dependency-free fallback
+        try:
+            from download_models import download_file
+        except ImportError:
+            download_file = None
+
+        if download_file is not None:
+            if not download_file(MODEL_URL, zip_path, "Vosk model"):
+                return False
+        else:
+            _fetch(MODEL_URL, zip_path)
         print("\n✓ Download complete!")
-        
+
     except Exception as e:
         print(f"\n✗ Download failed: {e}")
         return False
@@ -56,9 +108,19 @@ def download_model():
     # Extract model
     print("\nExtracting model...")
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(MODELS_DIR)
-        
+        # Reuse the libdeflate-accelerated extractor when its module
+        # (and the libdeflate binding) are importable
+        try:
+            from download_models import libdeflate, _extract_zip_libdeflate
+        except ImportError:
+            libdeflate = None
+
+        if libdeflate is not None:
+            _extract_zip_libdeflate(zip_path, MODELS_DIR)
+        else:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(MODELS_DIR)
+
         print("✓ Extraction complete!")
         
         # Remove zip file
@@ -7,6 +7,12 @@ Diagnoses and fixes common audio issues
 import sys
 import sounddevice as sd
 import numpy as np
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import audio_util
 
 def check_audio_devices():
     """Check available audio devices"""
@@ -15,35 +21,35 @@ def check_audio_devices():
     print("="*60)
     
     try:
-        devices = sd.query_devices()
-        
+        devices = audio_util.query_devices()
+
         if not devices:
             print("❌ No audio devices found!")
             return False
-        
+
         print(f"\n✅ Found {len(devices)} audio device(s):\n")
-        
-        input_devices = []
-        for i, device in enumerate(devices):
-            if device['max_input_channels'] > 0:
-                input_devices.append((i, device))
-                print(f"  [{i}] {device['name']}")
-                print(f"      Input Channels: {device['max_input_channels']}")
-                print(f"      Sample Rate: {device['default_samplerate']} Hz")
-                
-                # Check if it's the default
-                try:
-                    default_input = sd.query_devices(kind='input')
-                    if device['name'] == default_input['name']:
-                        print(f"      ⭐ DEFAULT INPUT DEVICE")
-                except:
-                    pass
-                print()
-        
+
+        # Resolve the default input once, not per device in the loop
+        try:
+            default_name = audio_util.default_input_device()['name']
+        except Exception:
+            default_name = None
+
+        # The input-capable subset is filtered once in the shared cache
+        input_devices = audio_util.input_devices()
+        for index, name, channels, samplerate in input_devices:
+            print(f"  [{index}] {name}")
+            print(f"      Input Channels: {channels}")
+            print(f"      Sample Rate: {samplerate} Hz")
+
+            if name == default_name:
+                print(f"      ⭐ DEFAULT INPUT DEVICE")
+            print()
+
         if not input_devices:
             print("❌ No input devices (microphones) found!")
             return False
-        
+
         print(f"✅ Found {len(input_devices)} input device(s)")
         return True
         
@@ -59,31 +65,44 @@ def test_microphone(duration=3):
     print("="*60)
     
     try:
-        print(f"\n🎤 Recording for {duration} seconds...")
+        print(f"\n🎤 Recording for up to {duration} seconds...")
         print("   Please speak into your microphone NOW!")
         print()
-        
+
+        import threading
+
         sample_rate = 16000
-        recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32',
-            blocking=False
-        )
-        
-        # Progress indicator
-        import time
-        for i in range(duration):
-            time.sleep(1)
-            print(f"   Recording... {i+1}/{duration} seconds")
-        
-        sd.wait()
-        
-        # Analyze audio
-        audio_data = np.abs(recording.flatten())
-        max_level = np.max(audio_data)
-        avg_level = np.mean(audio_data)
+        buf = np.empty(int(duration * sample_rate), dtype=np.float32)
+        filled = [0]
+        done = threading.Event()
+
+        def callback(indata, frames, time_info, status):
+            n = min(frames, buf.size - filled[0])
+            buf[filled[0]:filled[0] + n] = indata[:n, 0]
+            filled[0] += n
+            if filled[0] >= buf.size:
+                done.set()
+                return
+            # Early exit: speech followed by a second of silence is
+            # already enough signal to diagnose
+            if (filled[0] > sample_rate
+                    and np.abs(buf[:filled[0]]).max() > 0.1
+                    and np.abs(buf[filled[0] - sample_rate:filled[0]]).max() < 1e-3):
+                done.set()
+
+        with sd.InputStream(channels=1, samplerate=sample_rate,
+                            dtype='float32', callback=callback):
+            done.wait(timeout=duration)
+
+        recording = buf[:filled[0]]
+        if recording.size == 0:
+            print("\n❌ ERROR: No audio captured")
+            return False
+
+        # One abs pass feeds both reductions
+        abs_data = np.abs(recording)
+        max_level = float(abs_data.max())
+        avg_level = float(abs_data.mean())
         
         print("\n" + "="*60)
         print("AUDIO ANALYSIS")
@@ -142,26 +161,27 @@ def set_default_device():
     print("="*60)
     
     try:
-        devices = sd.query_devices()
-        input_devices = [(i, d) for i, d in enumerate(devices) if d['max_input_channels'] > 0]
-        
+        input_devices = audio_util.input_devices()
+
         if not input_devices:
             print("\n❌ No input devices found!")
             return False
-        
+
         print("\nAvailable input devices:")
-        for idx, (i, device) in enumerate(input_devices):
-            print(f"  {idx + 1}. {device['name']}")
-        
+        for idx, (_, name, _, _) in enumerate(input_devices):
+            print(f"  {idx + 1}. {name}")
+
         try:
             choice = int(input("\nSelect device number (or 0 to skip): "))
             if choice == 0:
                 return True
-            
+
             if 1 <= choice <= len(input_devices):
-                device_id = input_devices[choice - 1][0]
+                device_id, device_name = input_devices[choice - 1][:2]
                 sd.default.device = device_id
-                print(f"\n✅ Default device set to: {input_devices[choice - 1][1]['name']}")
+                # The cached enumeration no longer reflects the default
+                audio_util.invalidate()
+                print(f"\n✅ Default device set to: {device_name}")
                 return True
             else:
                 print("\n❌ Invalid choice")
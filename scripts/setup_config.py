@@ -3,24 +3,35 @@ Configuration Setup Utility
 Creates initial configuration files and directories
 """
 
-import json
-import pickle
+import asyncio
+import io
+import os
+import sys
 from pathlib import Path
 
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def setup_directories():
-    """Create necessary directories"""
-    directories = ['config', 'models', 'logs']
-    
-    print("Creating directories...")
+from modules import json_compat
+
+
+def setup_directories(out):
+    """Create necessary directories, reporting into out"""
+    directories = ('config', 'models', 'logs')
+
+    # Bare os.mkdir goes straight to the syscall: no Path allocation
+    # and no separate existence stat (EEXIST covers the re-run case)
+    out.write("Creating directories...\n")
     for directory in directories:
-        path = Path(directory)
-        path.mkdir(exist_ok=True)
-        print(f"  ✓ {directory}/")
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
+        out.write(f"  ✓ {directory}/\n")
 
 
 def setup_commands_config():
-    """Create default commands configuration"""
+    """Build the default commands configuration payload"""
     commands = {
         "system": {
             "shutdown": ["shutdown", "shut down", "power off"],
@@ -72,45 +83,34 @@ def setup_commands_config():
             "wake_up": ["wake up", "start listening", "resume", "hello echo"]
         }
     }
-    
-    config_file = Path("config/commands.json")
-    with open(config_file, 'w') as f:
-        json.dump(commands, f, indent=2)
-    
-    print(f"  ✓ {config_file}")
+
+    return Path("config/commands.json"), json_compat.dumps(commands, indent=True)
 
 
 def setup_apps_config():
-    """Create empty apps configuration"""
+    """Build the empty apps configuration payload"""
     apps = {"apps": []}
-    
-    config_file = Path("config/apps.json")
-    with open(config_file, 'w') as f:
-        json.dump(apps, f, indent=2)
-    
-    print(f"  ✓ {config_file}")
+
+    return Path("config/apps.json"), json_compat.dumps(apps, indent=True)
 
 
 def setup_user_database():
-    """Create empty user database"""
-    users_file = Path("config/users.pkl")
-    with open(users_file, 'wb') as f:
-        pickle.dump({}, f)
-    
-    print(f"  ✓ {users_file}")
+    """Build the empty user database sentinel
+
+    A zero-byte file marks "no legacy users": the migration in
+    modules.auth treats it as an empty dict, so there is nothing for
+    pickle to emit or parse here.
+    """
+    return Path("config/users.pkl"), b""
 
 
 def setup_sessions_database():
-    """Create empty sessions database"""
-    sessions_file = Path("config/sessions.pkl")
-    with open(sessions_file, 'wb') as f:
-        pickle.dump({}, f)
-    
-    print(f"  ✓ {sessions_file}")
+    """Build the empty sessions database sentinel"""
+    return Path("config/sessions.pkl"), b""
 
 
 def setup_settings():
-    """Create default settings"""
+    """Build the default settings payload"""
     settings = {
         "tts": {
             "rate": 150,
@@ -127,54 +127,82 @@ def setup_settings():
         },
         "ui": {
             "theme": "dark",
-            "show_waveform": true,
+            "show_waveform": True,
             "log_level": "INFO"
         }
     }
-    
-    config_file = Path("config/settings.json")
-    with open(config_file, 'w') as f:
-        json.dump(settings, f, indent=2)
-    
-    print(f"  ✓ {config_file}")
+
+    return Path("config/settings.json"), json_compat.dumps(settings, indent=True)
+
+
+async def _write_payloads(payloads):
+    """Write pre-serialized payloads concurrently
+
+    Each write blocks on close()/fsync in its own thread, so the wall
+    time approaches the slowest single write rather than the sum. The
+    semaphore caps open file handles.
+    """
+    # run_in_executor rather than asyncio.to_thread: the project still
+    # supports Python 3.8, where to_thread does not exist
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(4)
+
+    async def write_one(path, payload):
+        async with limit:
+            await loop.run_in_executor(None, path.write_bytes, payload)
+
+    await asyncio.gather(
+        *(write_one(path, payload) for path, payload in payloads)
+    )
 
 
 def main():
     """Main setup function"""
-    print("=" * 60)
-    print("EchoOS Configuration Setup")
-    print("=" * 60)
-    print()
-    
+    # All console output accumulates in one buffer flushed with a
+    # single stdout write at the end: one syscall instead of ~15 when
+    # stdout is an unbuffered pipe (CI log capture)
+    out = io.StringIO()
+    out.write("=" * 60 + "\n")
+    out.write("EchoOS Configuration Setup\n")
+    out.write("=" * 60 + "\n\n")
+
+    status = 0
     try:
         # Create directories
-        setup_directories()
-        print()
-        
-        # Create configuration files
-        print("Creating configuration files...")
-        setup_commands_config()
-        setup_apps_config()
-        setup_user_database()
-        setup_sessions_database()
-        setup_settings()
-        print()
-        
-        print("=" * 60)
-        print("✓ Configuration setup complete!")
-        print("=" * 60)
-        print()
-        print("Next steps:")
-        print("  1. Run: python scripts/download_vosk_model.py")
-        print("  2. Run: python scripts/discover_apps.py")
-        print("  3. Run: python main.py")
-        print()
-        
+        setup_directories(out)
+        out.write("\n")
+
+        # Serialize everything in memory first, then issue one write per
+        # file: write_bytes is a single open/write/close with no Python
+        # text-buffering layer in between
+        out.write("Creating configuration files...\n")
+        payloads = [
+            setup_commands_config(),
+            setup_apps_config(),
+            setup_user_database(),
+            setup_sessions_database(),
+            setup_settings(),
+        ]
+        asyncio.run(_write_payloads(payloads))
+        for path, _ in payloads:
+            out.write(f"  ✓ {path}\n")
+        out.write("\n")
+
+        out.write("=" * 60 + "\n")
+        out.write("✓ Configuration setup complete!\n")
+        out.write("=" * 60 + "\n\n")
+        out.write("Next steps:\n")
+        out.write("  1. Run: python scripts/download_vosk_model.py\n")
+        out.write("  2. Run: python scripts/discover_apps.py\n")
+        out.write("  3. Run: python main.py\n\n")
+
     except Exception as e:
-        print(f"❌ Error during setup: {e}")
-        return 1
-    
-    return 0
+        out.write(f"❌ Error during setup: {e}\n")
+        status = 1
+
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+    return status
 
 
 if __name__ == "__main__":
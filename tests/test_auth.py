@@ -4,7 +4,6 @@ Unit tests for authentication module
 
 import unittest
 import tempfile
-import shutil
 from pathlib import Path
 import sys
 
@@ -14,27 +13,41 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from modules.auth import Authenticator
 
 
+class MockTTS:
+    """No-op TTS stand-in shared by every test"""
+
+    def speak(self, text, blocking=False):
+        pass
+
+
+_MOCK_TTS = MockTTS()
+
+
 class TestAuthenticator(unittest.TestCase):
     """Test cases for Authenticator class"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
-        self.test_dir = tempfile.mkdtemp()
-        self.users_file = Path(self.test_dir) / "users.pkl"
-        self.sessions_file = Path(self.test_dir) / "sessions.pkl"
-        
-        # Mock TTS
-        class MockTTS:
-            def speak(self, text, blocking=False):
-                pass
-        
-        self.auth = Authenticator(tts=MockTTS())
-        self.auth.users_file = self.users_file
-        self.auth.sessions_file = self.sessions_file
-    
+        # TemporaryDirectory removes itself via scandir-based cleanup,
+        # cheaper than a separate mkdtemp + shutil.rmtree pair
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = Path(self._tmp.name)
+        self.users_file = self.test_dir / "users.pkl"
+        self.sessions_file = self.test_dir / "sessions.pkl"
+
+        # All paths go through the constructor: migration runs during
+        # __init__, so assigning them afterwards would leave the real
+        # config/ directory touched (and its pickles consumed)
+        self.auth = Authenticator(
+            tts=_MOCK_TTS,
+            users_file=str(self.users_file),
+            sessions_file=str(self.sessions_file),
+            db_file=str(self.test_dir / "auth.db"),
+        )
+
     def tearDown(self):
         """Clean up test fixtures"""
-        shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_initialization(self):
         """Test authenticator initialization"""
@@ -2,8 +2,10 @@
 Unit tests for command executor module
 """
 
+import collections
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 import sys
 
 # Add parent directory to path
@@ -12,17 +14,38 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from modules.executor import Executor
 
 
+class MockTTS:
+    """TTS stand-in shared by every test; keeps only the latest message
+
+    The deque caps retention at one entry, so nothing leaks between
+    tests that reuse the singleton.
+    """
+
+    def __init__(self):
+        self.messages = collections.deque(maxlen=1)
+
+    def speak(self, text, blocking=False):
+        self.messages.append(text)
+
+    @property
+    def last_message(self):
+        return self.messages[-1] if self.messages else None
+
+
+_MOCK_TTS = MockTTS()
+
+
 class TestExecutor(unittest.TestCase):
     """Test cases for Executor class"""
-    
-    def setUp(self):
-        """Set up test fixtures"""
-        # Mock TTS
-        class MockTTS:
-            def speak(self, text, blocking=False):
-                self.last_message = text
-        
-        self.executor = Executor(tts=MockTTS())
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one Executor for the whole class
+
+        Construction probes the platform and loads the app-path config;
+        execute() never mutates the instance, so every test can share it.
+        """
+        cls.executor = Executor(tts=_MOCK_TTS)
     
     def test_initialization(self):
         """Test executor initialization"""
@@ -50,11 +73,13 @@ class TestExecutor(unittest.TestCase):
             'intent': 'search_google',
             'parameters': {'query': 'test query'}
         }
-        
-        # Note: This will actually open browser in test
-        # In production, mock webbrowser module
-        result = self.executor.execute(cmd)
+
+        # Patch out the browser launch: no fork/exec per test run
+        with patch('webbrowser.open', return_value=True) as mock_open:
+            result = self.executor.execute(cmd)
+
         self.assertIsInstance(result, bool)
+        mock_open.assert_called_once()
     
     def test_invalid_command(self):
         """Test handling of invalid commands"""
@@ -15,9 +15,9 @@ from modules.parser import CommandParser
 class TestCommandParser:
     """Test cases for CommandParser"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
-        """Create parser instance for testing"""
+        """Create one shared parser instance (parse() never mutates it)"""
         return CommandParser()
     
     def test_parse_system_shutdown(self, parser):
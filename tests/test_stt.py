@@ -30,11 +30,14 @@ class TestVoskManager(unittest.TestCase):
     def test_initialization(self):
         """Test STT manager initialization"""
         self.assertIsNotNone(self.stt)
+        # The model loads on a background thread, so wait for the
+        # preload before asserting on it
+        self.assertTrue(self.stt.is_model_loaded(timeout=30))
         self.assertIsNotNone(self.stt.model)
-    
+
     def test_model_loading(self):
         """Test Vosk model loading"""
-        # Model should be loaded during initialization
+        # Model loading starts during initialization
         self.assertTrue(hasattr(self.stt, 'model'))
     
     def test_recognizer_creation(self):